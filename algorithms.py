@@ -1,106 +1,103 @@
 # algorithms.py
-from typing import List, Dict
+from array import array
+from bisect import bisect_left
+from typing import List
+import numpy as np
+from results import ScheduleResult
+from engine import scan_array, look_array, c_scan_array, c_look_array
+from geometry import sptf
 
-def fcfs(requests: List[int], head: int) -> Dict:
-    path = [head]
-    total = 0
-    for r in requests:
-        total += abs(r - path[-1])
-        path.append(r)
-    return {"name": "FCFS", "order": requests, "path": path, "total_head_movement": total}
+def fcfs(requests: List[int], head: int) -> ScheduleResult:
+    path = np.concatenate([[head], np.asarray(requests, dtype=np.int64)])
+    total = int(np.abs(np.diff(path)).sum())
+    return ScheduleResult("FCFS", path, total)
 
-def sstf(requests: List[int], head: int) -> Dict:
-    remaining = requests.copy()
+def sstf(requests: List[int], head: int) -> ScheduleResult:
+    """
+    SSTF on a sorted array:
+    Serviced cylinders always form a contiguous block of the sorted requests, so the
+    nearest pending request is one of the two neighbours of that block (two pointers).
+    Ties go to the cylinder that appears first in `requests`, like min() over the queue.
+    """
+    cylinders, first_seen, counts = np.unique(np.asarray(requests, dtype=np.int64),
+                                              return_index=True, return_counts=True)
+    return sstf_unique(cylinders, first_seen, counts, head)
+
+def sstf_unique(cylinders: np.ndarray, first_seen: np.ndarray, counts: np.ndarray, head: int) -> ScheduleResult:
+    """SSTF from the distinct sorted cylinders, each one's first queue index and multiplicity."""
+    cyl = cylinders.tolist()
+    first = first_seen.tolist()
+    hi = bisect_left(cyl, head)
+    lo = hi - 1
     pos = head
-    path = [pos]
-    total = 0
-    while remaining:
-        nearest = min(remaining, key=lambda x: abs(x - pos))
-        total += abs(nearest - pos)
-        pos = nearest
-        path.append(pos)
-        remaining.remove(nearest)
-    return {"name": "SSTF", "order": [p for p in path[1:]], "path": path, "total_head_movement": total}
+    visit = array("q")
+    while lo >= 0 or hi < len(cyl):
+        if hi >= len(cyl):
+            take_left = True
+        elif lo < 0:
+            take_left = False
+        else:
+            d_left = pos - cyl[lo]
+            d_right = cyl[hi] - pos
+            if d_left != d_right:
+                take_left = d_left < d_right
+            else:
+                take_left = first[lo] < first[hi]
+        if take_left:
+            visit.append(lo); pos = cyl[lo]; lo -= 1
+        else:
+            visit.append(hi); pos = cyl[hi]; hi += 1
+    visit = np.frombuffer(visit, dtype=np.int64)
+    stops = np.concatenate([[head], cylinders[visit]])
+    path = np.concatenate([[head], np.repeat(cylinders[visit], counts[visit])])
+    return ScheduleResult("SSTF", path, int(np.abs(np.diff(stops)).sum()))
 
 def scan(requests: List[int], head: int, direction: str = "right",
-         disk_start: int = 0, disk_end: int = 199) -> Dict:
-    path = [head]
-    total = 0
-    left = sorted([r for r in requests if r < head])
-    right = sorted([r for r in requests if r >= head])
-    if direction == "right":
-        for r in right:
-            total += abs(r - path[-1]); path.append(r)
-        if path[-1] != disk_end:
-            total += abs(disk_end - path[-1]); path.append(disk_end)
-        for r in reversed(left):
-            total += abs(r - path[-1]); path.append(r)
-    else:
-        for r in reversed(left):
-            total += abs(r - path[-1]); path.append(r)
-        if path[-1] != disk_start:
-            total += abs(path[-1] - disk_start); path.append(disk_start)
-        for r in right:
-            total += abs(r - path[-1]); path.append(r)
-    serviced = [x for x in path[1:] if x in requests]
-    return {"name": "SCAN", "order": serviced, "path": path, "total_head_movement": total}
+         disk_start: int = 0, disk_end: int = 199) -> ScheduleResult:
+    return scan_array(requests, head, direction=direction, disk_start=disk_start, disk_end=disk_end)
 
-def look(requests: List[int], head: int, direction: str = "right") -> Dict:
-    path = [head]
-    total = 0
-    left = sorted([r for r in requests if r < head])
-    right = sorted([r for r in requests if r >= head])
-    if direction == "right":
-        for r in right:
-            total += abs(r - path[-1]); path.append(r)
-        for r in reversed(left):
-            total += abs(r - path[-1]); path.append(r)
-    else:
-        for r in reversed(left):
-            total += abs(r - path[-1]); path.append(r)
-        for r in right:
-            total += abs(r - path[-1]); path.append(r)
-    serviced = [x for x in path[1:] if x in requests]
-    return {"name": "LOOK", "order": serviced, "path": path, "total_head_movement": total}
+def look(requests: List[int], head: int, direction: str = "right") -> ScheduleResult:
+    return look_array(requests, head, direction=direction)
 
-def c_scan(requests: List[int], head: int, disk_start: int = 0, disk_end: int = 199) -> Dict:
+def c_scan(requests: List[int], head: int, disk_start: int = 0, disk_end: int = 199) -> ScheduleResult:
     """
     Circular SCAN (C-SCAN):
     Move right servicing requests; when at end jump to start (visual jump).
     For fairness we usually don't count the jump in movement; here jump is visual only.
     """
-    path = [head]
-    total = 0
-    left = sorted([r for r in requests if r < head])
-    right = sorted([r for r in requests if r >= head])
-    # service right
-    for r in right:
-        total += abs(r - path[-1]); path.append(r)
-    if path[-1] != disk_end:
-        total += abs(disk_end - path[-1]); path.append(disk_end)
-    # visual jump to start for clarity (no added total)
-    if left:
-        path.append(disk_start)  # visual wrap
-        for r in left:
-            total += abs(r - path[-1]); path.append(r)
-    serviced = [x for x in path[1:] if x in requests]
-    return {"name": "C-SCAN", "order": serviced, "path": path, "total_head_movement": total}
+    return c_scan_array(requests, head, disk_start=disk_start, disk_end=disk_end)
 
-def c_look(requests: List[int], head: int) -> Dict:
+def c_look(requests: List[int], head: int) -> ScheduleResult:
     """
     C-LOOK:
     Service right side, then jump to lowest requested cylinder and continue.
     Jump is visual only (not added to total).
     """
-    path = [head]
-    total = 0
-    left = sorted([r for r in requests if r < head])
-    right = sorted([r for r in requests if r >= head])
-    for r in right:
-        total += abs(r - path[-1]); path.append(r)
-    if left:
-        path.append(min(left))  # visual wrap
-        for r in left:
-            total += abs(r - path[-1]); path.append(r)
-    serviced = [x for x in path[1:] if x in requests]
-    return {"name": "C-LOOK", "order": serviced, "path": path, "total_head_movement": total}
+    return c_look_array(requests, head)
+
+# --- Registry: one dispatch point for the UI, cache and CLI ---
+# name -> (function, keyword parameters it accepts besides requests/head)
+ALGORITHMS = {
+    "FCFS": (fcfs, ()),
+    "SSTF": (sstf, ()),
+    "SCAN": (scan, ("direction", "disk_start", "disk_end")),
+    "LOOK": (look, ("direction",)),
+    "C-SCAN": (c_scan, ("disk_start", "disk_end")),
+    "C-LOOK": (c_look, ()),
+    "SPTF": (sptf, ()),  # cylinder-only requests: seek-only positioning
+}
+ALGORITHM_NAMES = list(ALGORITHMS)
+
+def register_algorithm(name: str, fn, params=()):
+    ALGORITHMS[name.upper()] = (fn, tuple(params))
+    if name.upper() not in ALGORITHM_NAMES:
+        ALGORITHM_NAMES.append(name.upper())
+
+def run_algorithm(name: str, requests: List[int], head: int, direction: str = "right",
+                  disk_start: int = 0, disk_end: int = 199) -> ScheduleResult:
+    key = name.upper()
+    if key not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {name}")
+    fn, params = ALGORITHMS[key]
+    options = {"direction": direction, "disk_start": disk_start, "disk_end": disk_end}
+    return fn(requests, head, **{p: options[p] for p in params})
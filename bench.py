@@ -0,0 +1,214 @@
+# bench.py
+"""
+Benchmark suite for the scheduling engines, parse_requests and compute_disk_metrics.
+
+    python bench.py                          # run and print a table
+    python bench.py --save-baseline          # record bench_baseline.json
+    python bench.py --threshold 0.25         # fail (exit 1) on >25% slowdowns vs the baseline
+    python bench.py --startup                # cold-start import budget (exit 1 if over budget)
+
+Every target runs at sizes 10..10^6 over uniform, clustered and sequential workloads
+and records best-of-N wall time, peak traced memory and requests per second.
+Baselines are machine-specific; record one on the machine that runs the gate.
+The startup check runs each entry point in fresh interpreters and gates the import
+cost on top of numpy against fixed budgets, and that no UI module gets imported.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+import numpy as np
+from algorithms import ALGORITHM_NAMES, run_algorithm
+from utils import compute_disk_metrics, parse_requests
+
+BASELINE_FILE = "bench_baseline.json"
+SIZES = [10 ** k for k in range(1, 7)]
+DISK_END = 199_999
+HEAD = DISK_END // 2
+MIN_GATED_SECONDS = 1e-3  # timings below this are too noisy to gate on
+
+
+def uniform(n: int, rng: np.random.Generator) -> np.ndarray:
+    return rng.integers(0, DISK_END + 1, n)
+
+
+def clustered(n: int, rng: np.random.Generator) -> np.ndarray:
+    centers = rng.integers(0, DISK_END + 1, max(1, n // 1000 + 1))
+    values = rng.choice(centers, n) + rng.normal(0, DISK_END / 200, n).astype(np.int64)
+    return np.clip(values, 0, DISK_END)
+
+
+def sequential(n: int, rng: np.random.Generator) -> np.ndarray:
+    start = int(rng.integers(0, DISK_END + 1))
+    return (start + np.arange(n)) % (DISK_END + 1)
+
+
+WORKLOADS = {"uniform": uniform, "clustered": clustered, "sequential": sequential}
+
+
+def _targets() -> Dict[str, Callable[[np.ndarray], Callable[[], object]]]:
+    """name -> setup(requests) returning the zero-argument callable to time."""
+    targets = {}
+    for name in ALGORITHM_NAMES:
+        targets[name] = lambda reqs, name=name: (lambda: run_algorithm(name, reqs, HEAD, "right", 0, DISK_END))
+
+    def parse(reqs):
+        text = ", ".join(map(str, reqs.tolist()))
+        return lambda: parse_requests(text)
+
+    def metrics(reqs):
+        path = run_algorithm("SCAN", reqs, HEAD, "right", 0, DISK_END)["path"]
+        return lambda: compute_disk_metrics(path, len(reqs))
+
+    targets["parse_requests"] = parse
+    targets["compute_disk_metrics"] = metrics
+    return targets
+
+
+def measure(fn: Callable[[], object], n: int, repeats: int) -> Dict:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak, "req_per_sec": n / best if best > 0 else float("inf")}
+
+
+def run_suite(targets: List[str], workloads: List[str], sizes: List[int], repeats: int, seed: int) -> List[Dict]:
+    setups = _targets()
+    rows = []
+    for workload in workloads:
+        for n in sizes:
+            reqs = WORKLOADS[workload](n, np.random.default_rng(seed))
+            for target in targets:
+                fn = setups[target](reqs)
+                rows.append({"target": target, "workload": workload, "size": n,
+                             **measure(fn, n, repeats if n < 10 ** 6 else 1)})
+                print(f"{target:>22} {workload:>10} {n:>8}  {rows[-1]['seconds'] * 1e3:10.3f} ms  "
+                      f"{rows[-1]['peak_bytes'] / 2 ** 20:8.2f} MiB  {rows[-1]['req_per_sec']:14,.0f} req/s",
+                      file=sys.stderr)
+    return rows
+
+
+def compare(rows: List[Dict], baseline: List[Dict], threshold: float) -> List[str]:
+    base = {(r["target"], r["workload"], r["size"]): r for r in baseline}
+    failures = []
+    for r in rows:
+        b = base.get((r["target"], r["workload"], r["size"]))
+        if b is None or max(r["seconds"], b["seconds"]) < MIN_GATED_SECONDS:
+            continue
+        ratio = r["seconds"] / b["seconds"]
+        if ratio > 1 + threshold:
+            failures.append(f"{r['target']} {r['workload']} n={r['size']}: "
+                            f"{b['seconds'] * 1e3:.3f} ms -> {r['seconds'] * 1e3:.3f} ms ({ratio:.2f}x)")
+    return failures
+
+
+# --- cold start ---
+STARTUP_TARGETS = {
+    "diskcore": "import diskcore",
+    "diskcore run": "import diskcore; diskcore.run_algorithm('SCAN', [98, 183, 37, 122], 53).metrics()",
+    "cli": "import cli",
+    "utils": "import utils",
+}
+STARTUP_BUDGET_MS = {"diskcore": 5, "diskcore run": 30, "cli": 30, "utils": 30}  # on top of numpy
+UI_MODULES = ("streamlit", "pandas", "plotly", "pyarrow")
+_STARTUP_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import numpy
+t1 = time.perf_counter()
+{code}
+t2 = time.perf_counter()
+print(json.dumps({{"numpy_ms": (t1 - t0) * 1e3, "own_ms": (t2 - t1) * 1e3,
+                  "ui_modules": sorted(m for m in {ui!r} if m in sys.modules)}}))
+"""
+
+
+def measure_startup(repeats: int = 5) -> List[Dict]:
+    """Best-of-N import cost per entry point, each run in a fresh interpreter."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    rows = []
+    for name, code in STARTUP_TARGETS.items():
+        runs = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            out = subprocess.run([sys.executable, "-c", _STARTUP_PROBE.format(code=code, ui=UI_MODULES)],
+                                 capture_output=True, text=True, check=True, cwd=here)
+            runs.append({**json.loads(out.stdout), "process_ms": (time.perf_counter() - start) * 1e3})
+        rows.append({"target": name, "own_ms": round(min(r["own_ms"] for r in runs), 2),
+                     "numpy_ms": round(min(r["numpy_ms"] for r in runs), 2),
+                     "process_ms": round(min(r["process_ms"] for r in runs), 2),
+                     "budget_ms": STARTUP_BUDGET_MS[name], "ui_modules": runs[0]["ui_modules"]})
+    return rows
+
+
+def check_startup(rows: List[Dict]) -> List[str]:
+    failures = []
+    for r in rows:
+        if r["own_ms"] > r["budget_ms"]:
+            failures.append(f"{r['target']}: {r['own_ms']:.2f} ms > {r['budget_ms']} ms budget")
+        if r["ui_modules"]:
+            failures.append(f"{r['target']}: imports {', '.join(r['ui_modules'])}")
+    return failures
+
+
+def main(argv=None):
+    setups = _targets()
+    parser = argparse.ArgumentParser(description="Benchmark scheduling engines and helpers.")
+    parser.add_argument("--targets", nargs="+", default=list(setups), choices=list(setups), metavar="NAME")
+    parser.add_argument("--workloads", nargs="+", default=list(WORKLOADS), choices=list(WORKLOADS))
+    parser.add_argument("--max-size", type=int, default=SIZES[-1])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--output", help="write this run's results as JSON")
+    parser.add_argument("--startup", action="store_true", help="check cold-start import budgets instead")
+    args = parser.parse_args(argv)
+
+    if args.startup:
+        rows = measure_startup(args.repeats)
+        for r in rows:
+            print(f"{r['target']:<14} {r['own_ms']:>8.2f} ms (budget {r['budget_ms']} ms)  "
+                  f"numpy {r['numpy_ms']:.2f} ms  process {r['process_ms']:.2f} ms")
+        failures = check_startup(rows)
+        for line in failures:
+            print("  " + line)
+        return 1 if failures else 0
+
+    sizes = [n for n in SIZES if n <= args.max_size]
+    rows = run_suite(args.targets, args.workloads, sizes, args.repeats, args.seed)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(rows, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(rows, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline first.")
+        return 0
+    with open(args.baseline) as f:
+        failures = compare(rows, json.load(f), args.threshold)
+    if failures:
+        print("Performance regressions:")
+        for line in failures:
+            print("  " + line)
+        return 1
+    print("No regressions beyond threshold.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
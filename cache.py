@@ -0,0 +1,146 @@
+# cache.py
+"""
+Memoized schedule results shared across Streamlit reruns and sessions.
+Entries are keyed by a content hash of the request array and every parameter
+that affects the schedule or its metrics, and evicted LRU-first once either the
+entry count or the total byte size limit is exceeded.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+import numpy as np
+from profiling import stage
+
+MAX_ENTRIES = 128
+MAX_BYTES = 256 << 20
+
+
+def requests_digest(requests) -> str:
+    data = np.ascontiguousarray(np.asarray(requests, dtype=np.int64))
+    return hashlib.blake2b(data.tobytes(), digest_size=16).hexdigest()
+
+
+def cache_key(digest: str, algorithm: str, head: int, direction: str = "right",
+              disk_start: int = 0, disk_end: int = 199, seek_model=None) -> str:
+    seek = seek_model.spec() if seek_model is not None else None
+    params = [digest, algorithm.upper(), int(head), direction, int(disk_start), int(disk_end), seek]
+    return hashlib.blake2b(json.dumps(params, sort_keys=True).encode(), digest_size=16).hexdigest()
+
+
+def _sizeof(value) -> int:
+    if isinstance(value, tuple):
+        return sum(_sizeof(v) for v in value)
+    return int(getattr(value, "nbytes", 0)) + 256
+
+
+class ResultCache:
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()  # key -> (value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, value) -> None:
+        size = _sizeof(value)
+        with self._lock:
+            if key in self._data:
+                self._bytes -= self._data.pop(key)[1]
+            if size > self.max_bytes:
+                return  # larger than the whole cache; don't flush everything for it
+            self._data[key] = (value, size)
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, old_size) = self._data.popitem(last=False)
+                self._bytes -= old_size
+                self.evictions += 1
+
+    def get_or_compute(self, key: str, compute: Callable):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0,
+        }
+
+
+RESULT_CACHE = ResultCache()
+
+
+def cached_run(algorithm: str, run: Callable, digest: str, head: int, direction: str = "right",
+               disk_start: int = 0, disk_end: int = 199, seek_model=None,
+               cache: Optional[ResultCache] = None):
+    """Return (result, metrics) for one algorithm, computing them with run() on a miss."""
+    cache = cache if cache is not None else RESULT_CACHE
+    key = cache_key(digest, algorithm, head, direction, disk_start, disk_end, seek_model)
+
+    def compute():
+        with stage("schedule"):
+            res = run()
+        with stage("metrics"):
+            return res, res.metrics(seek_model=seek_model)
+
+    with stage(f"cached_run {algorithm}") as record:
+        hit = key in cache
+        value = cache.get_or_compute(key, compute)
+        if record is not None:
+            record["cache"] = "hit" if hit else "miss"
+        return value
+
+
+def cached_compare(algorithms, run_all: Callable, digest: str, head: int, direction: str = "right",
+                   disk_start: int = 0, disk_end: int = 199, seek_model=None,
+                   cache: Optional[ResultCache] = None) -> Dict:
+    """
+    {algorithm: (result, metrics)} sharing entries with cached_run. Every miss is
+    computed by a single run_all(missing_algorithms) call, e.g. compare.compare_all.
+    """
+    cache = cache if cache is not None else RESULT_CACHE
+    keys = {a: cache_key(digest, a, head, direction, disk_start, disk_end, seek_model) for a in algorithms}
+    with stage("cached_compare") as record:
+        found = {a: cache.get(k) for a, k in keys.items()}
+        missing = [a for a, v in found.items() if v is None]
+        if missing:
+            fresh = run_all(missing)
+            for a in missing:
+                found[a] = fresh[a.upper()]
+                cache.put(keys[a], found[a])
+        if record is not None:
+            record["cache"] = f"{len(keys) - len(missing)} hits / {len(missing)} misses"
+        return found
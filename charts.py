@@ -0,0 +1,127 @@
+# charts.py
+"""
+Head-movement figures.
+The animation is built once as a single Plotly figure with animation frames and
+played client-side, instead of re-sending a new figure for every step. Long
+paths are batched so the number of frames (and the points they carry) stays bounded.
+Paths above WEBGL_THRESHOLD points are drawn with Scattergl from an LTTB
+(largest-triangle-three-buckets) downsample; a step window can be re-rendered
+at full resolution.
+"""
+import math
+import numpy as np
+import plotly.graph_objects as go
+from profiling import timed
+
+LINE_COLOR = "#38bdf8"
+MARKER_COLOR = "#22d3ee"
+MAX_FRAMES = 300
+FRAME_POINT_BUDGET = 500_000  # points summed over all frames
+MARKER_LIMIT = 500  # above this, draw lines only
+WEBGL_THRESHOLD = 20_000
+DOWNSAMPLE_POINTS = 5_000
+
+
+def lttb(y, n_out: int) -> np.ndarray:
+    """Indices of the points kept by largest-triangle-three-buckets (x = step index)."""
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)  # n_out - 2 inner buckets
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        if b + 2 < len(edges):
+            nxt_lo, nxt_hi = edges[b + 1], edges[b + 2]
+        else:
+            nxt_lo, nxt_hi = n - 1, n
+        cx = (nxt_lo + nxt_hi - 1) / 2.0
+        cy = y[nxt_lo:nxt_hi].mean()
+        xs = np.arange(lo, hi)
+        area = np.abs((a - cx) * (y[lo:hi] - y[a]) - (a - xs) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        keep[b + 1] = a
+    return keep
+
+
+def frame_ends(n: int, max_frames: int = MAX_FRAMES, point_budget: int = FRAME_POINT_BUDGET) -> np.ndarray:
+    """End index (exclusive) of each frame; one step per frame for short paths, batched for long ones."""
+    if n <= 1:
+        return np.array([n], dtype=np.int64)
+    frames = min(n, max_frames, max(2, 2 * point_budget // n))
+    batch = math.ceil(n / frames)
+    ends = np.arange(1, n + batch, batch)
+    ends[-1] = n
+    return np.unique(ends)
+
+
+def _narrate(path: np.ndarray, i: int) -> str:
+    if i == 0:
+        return f"Start at head position: {path[0]}"
+    return f"Step {i}: Move head from {path[i-1]} to {path[i]} (distance = {abs(int(path[i]) - int(path[i-1]))})"
+
+
+def _y_range(path: np.ndarray):
+    return [int(path.min()) - 5, int(path.max()) + 5] if path.size else None
+
+
+def _trace(steps: np.ndarray, path: np.ndarray, markers: bool, webgl: bool = False):
+    cls = go.Scattergl if webgl else go.Scatter
+    return cls(x=steps, y=path, mode="lines+markers" if markers else "lines",
+               line=dict(color=LINE_COLOR), marker=dict(size=10, color=MARKER_COLOR), name="Head")
+
+
+@timed("render")
+def path_figure(path, title: str, markers: bool = True, window=None) -> go.Figure:
+    """Static head-movement figure; `window=(start, end)` limits it to those steps."""
+    p = np.asarray(path)
+    start, end = (0, len(p)) if window is None else (max(int(window[0]), 0), min(int(window[1]), len(p)))
+    seg = p[start:end]
+    idx = np.arange(len(seg))
+    webgl = len(seg) > WEBGL_THRESHOLD
+    if webgl:
+        idx = lttb(seg, DOWNSAMPLE_POINTS)
+        title = f"{title} ({len(idx):,} of {len(seg):,} points)"
+    fig = go.Figure(data=[_trace(start + idx, seg[idx], markers and len(idx) <= MARKER_LIMIT, webgl)])
+    fig.update_layout(title=title, template="plotly_dark",
+                      xaxis=dict(title="Step"), yaxis=dict(title="Cylinder", range=_y_range(seg)))
+    return fig
+
+
+@timed("render")
+def animated_path_figure(path, title: str, seconds_per_frame: float = 0.3) -> go.Figure:
+    p = np.asarray(path)
+    n = len(p)
+    steps = lttb(p, DOWNSAMPLE_POINTS) if n > WEBGL_THRESHOLD else np.arange(n)
+    shown = p[steps]
+    markers = len(steps) <= MARKER_LIMIT
+    ends = frame_ends(len(steps))
+    frames = [go.Frame(data=[_trace(steps[:e], shown[:e], markers)], name=str(e)) for e in ends]
+    fig = go.Figure(data=[_trace(steps[:1], shown[:1], markers)], frames=frames)
+    duration = int(seconds_per_frame * 1000)
+    play = {"frame": {"duration": duration, "redraw": False}, "fromcurrent": True,
+            "transition": {"duration": 0}, "mode": "immediate"}
+    pause = {"frame": {"duration": 0, "redraw": False}, "mode": "immediate"}
+    fig.update_layout(
+        title=title,
+        template="plotly_dark",
+        xaxis=dict(title="Step", range=[-0.5, max(n - 0.5, 0.5)]),
+        yaxis=dict(title="Cylinder", range=_y_range(p)),
+        updatemenus=[{
+            "type": "buttons", "showactive": False, "x": 0, "y": -0.15, "xanchor": "left",
+            "buttons": [
+                {"label": "▶ Play", "method": "animate", "args": [None, play]},
+                {"label": "⏸ Pause", "method": "animate", "args": [[None], pause]},
+            ],
+        }],
+        sliders=[{
+            "x": 0.15, "y": -0.15, "len": 0.85,
+            "currentvalue": {"prefix": ""},
+            "steps": [{"label": _narrate(p, int(steps[e - 1])), "method": "animate",
+                       "args": [[str(e)], pause]} for e in ends],
+        }],
+    )
+    return fig
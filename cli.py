@@ -0,0 +1,110 @@
+# cli.py
+"""
+Headless batch runner.
+
+    python cli.py traces/*.txt --algorithms SCAN C-LOOK --head 50 --output results.json
+
+Each trace file is one unit of work; traces are spread over a process pool in
+chunks, and every selected algorithm runs on a trace inside the same worker so
+the trace is loaded once.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from functools import partial
+from typing import Dict, List, Optional
+from algorithms import ALGORITHM_NAMES, run_algorithm
+from metrics import make_seek_model
+from raid import LEVELS, simulate_array
+from traces import FORMATS, SECTORS_PER_CYLINDER, load_trace
+
+
+def evaluate_trace(trace: str, algorithms: List[str], head: int, direction: str, disk_start: int,
+                   disk_end: int, seek_model_spec: Dict, trace_format: str,
+                   sectors_per_cylinder: int, disks: int = 1, raid_level: str = "raid0",
+                   chunk_size: int = 8, column: Optional[int] = None) -> List[Dict]:
+    requests = load_trace(trace, fmt=trace_format, sectors_per_cylinder=sectors_per_cylinder, column=column)
+    seek_model = make_seek_model(seek_model_spec)
+    rows = []
+    for name in algorithms:
+        start = time.perf_counter()
+        if disks > 1:
+            # the trace is the logical stream of an array; disks run serially inside this worker
+            metrics, _ = simulate_array(requests, disks, name, raid_level, chunk_size, head, direction,
+                                        disk_start, disk_end, seek_model_spec, workers=1)
+            rows.append({"trace": trace, **metrics, "head": head, "direction": direction,
+                         "disk_start": disk_start, "disk_end": disk_end,
+                         "run_seconds": round(time.perf_counter() - start, 6)})
+            continue
+        res = run_algorithm(name, requests, head, direction, disk_start, disk_end)
+        metrics = res.metrics(seek_model=seek_model)
+        rows.append({"trace": trace, "algorithm": name, "requests": int(len(requests)),
+                     "head": head, "direction": direction, "disk_start": disk_start, "disk_end": disk_end,
+                     **metrics, "run_seconds": round(time.perf_counter() - start, 6)})
+    return rows
+
+
+def run_batch(traces: List[str], algorithms: List[str], workers: int = None, chunksize: int = 1, **options) -> List[Dict]:
+    work = partial(evaluate_trace, algorithms=algorithms, **options)
+    if workers == 1 or len(traces) == 1:
+        return [row for trace in traces for row in work(trace)]
+    from concurrent.futures import ProcessPoolExecutor  # deferred: ~20 ms of multiprocessing imports
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [row for rows in pool.map(work, traces, chunksize=chunksize) for row in rows]
+
+
+def write_results(rows: List[Dict], output: str, fmt: str = "auto"):
+    if fmt == "auto":
+        fmt = "parquet" if output.endswith(".parquet") else "json"
+    if fmt == "parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("pyarrow is required for Parquet output (pip install pyarrow)")
+        pq.write_table(pa.Table.from_pylist(rows), output, compression="zstd")
+    elif output == "-":
+        json.dump(rows, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(output, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run disk scheduling algorithms over trace files.")
+    parser.add_argument("traces", nargs="+", help="trace files (csv, whitespace, blktrace, fio)")
+    parser.add_argument("--algorithms", nargs="+", default=ALGORITHM_NAMES, type=str.upper,
+                        choices=ALGORITHM_NAMES, metavar="NAME", help=f"default: all of {' '.join(ALGORITHM_NAMES)}")
+    parser.add_argument("--head", type=int, default=50)
+    parser.add_argument("--direction", choices=["right", "left"], default="right")
+    parser.add_argument("--disk-start", type=int, default=0)
+    parser.add_argument("--disk-end", type=int, default=199)
+    parser.add_argument("--seek-ms", type=float, default=1.0, help="linear seek time per cylinder")
+    parser.add_argument("--seek-model", default=None,
+                        help='seek curve spec as JSON, e.g. \'{"kind": "sqrt", "settle_ms": 1.5}\'')
+    parser.add_argument("--trace-format", choices=["auto", *FORMATS], default="auto")
+    parser.add_argument("--sectors-per-cylinder", type=int, default=SECTORS_PER_CYLINDER)
+    parser.add_argument("--column", type=int, default=None, help="0-based column of a multi-column CSV trace")
+    parser.add_argument("--disks", type=int, default=1, help="simulate an array of this many disks per trace")
+    parser.add_argument("--raid-level", choices=LEVELS, default="raid0")
+    parser.add_argument("--chunk-size", type=int, default=8, help="stripe chunk, in cylinders")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunksize", type=int, default=1, help="traces handed to a worker at a time")
+    parser.add_argument("--output", "-o", default="-", help="output file (.json or .parquet), '-' for stdout")
+    parser.add_argument("--output-format", choices=["auto", "json", "parquet"], default="auto")
+    args = parser.parse_args(argv)
+
+    seek_spec = json.loads(args.seek_model) if args.seek_model else {"kind": "linear", "ms_per_cylinder": args.seek_ms}
+    rows = run_batch(args.traces, args.algorithms, workers=args.workers, chunksize=args.chunksize,
+                     head=args.head, direction=args.direction, disk_start=args.disk_start,
+                     disk_end=args.disk_end, seek_model_spec=seek_spec, trace_format=args.trace_format,
+                     sectors_per_cylinder=args.sectors_per_cylinder, disks=args.disks,
+                     raid_level=args.raid_level, chunk_size=args.chunk_size, column=args.column)
+    write_results(rows, args.output, args.output_format)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# compare.py
+"""
+Fused Compare-All evaluator.
+One stable argsort of the requests is shared by every algorithm: it gives the
+left/right split at the head for the sweep family, the distinct cylinders with
+their first queue index and multiplicity for SSTF and seek-only SPTF, and the
+min/max for the static optimum that every metrics row needs.
+Schedules and metrics are identical to run_algorithm() + ScheduleResult.metrics().
+"""
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+import numpy as np
+from algorithms import ALGORITHM_NAMES, fcfs, run_algorithm, sstf_unique
+from engine import c_look_split, c_scan_split, look_split, scan_split, split_at_head
+from metrics import compute_metrics
+from oracle import static_optimum
+from profiling import timed
+from results import ScheduleResult
+
+
+class SortedRequests(NamedTuple):
+    requests: np.ndarray
+    left: np.ndarray    # sorted requests < head
+    right: np.ndarray   # sorted requests >= head
+    cylinders: np.ndarray
+    first_seen: np.ndarray
+    counts: np.ndarray
+    optimal: int
+
+
+def presort(requests, head: int) -> SortedRequests:
+    r = np.asarray(requests, dtype=np.int64)
+    index = np.argsort(r, kind="stable")
+    s = r[index]
+    left, right = split_at_head(s, head)
+    starts = np.flatnonzero(np.diff(s, prepend=s[:1] - 1)) if s.size else np.empty(0, dtype=np.int64)
+    # the stable sort puts each cylinder's earliest queue index first in its run
+    cylinders, first_seen = s[starts], index[starts]
+    counts = np.diff(np.append(starts, s.size))
+    optimal = static_optimum(s[[0, -1]] if s.size else s, head)
+    return SortedRequests(r, left, right, cylinders, first_seen, counts, optimal)
+
+
+def _sptf(p: SortedRequests, head: int) -> ScheduleResult:
+    # seek-only SPTF is SSTF over distinct cylinders with ties going to the lower cylinder
+    res = sstf_unique(p.cylinders, np.arange(p.cylinders.size), p.counts, head)
+    return ScheduleResult("SPTF", res.path, res.total_head_movement)
+
+
+# name -> builder(presorted, head, direction, disk_start, disk_end)
+BUILDERS = {
+    "FCFS": lambda p, head, direction, ds, de: fcfs(p.requests, head),
+    "SSTF": lambda p, head, direction, ds, de: sstf_unique(p.cylinders, p.first_seen, p.counts, head),
+    "SCAN": lambda p, head, direction, ds, de: scan_split(p.left, p.right, head, direction, ds, de),
+    "LOOK": lambda p, head, direction, ds, de: look_split(p.left, p.right, head, direction),
+    "C-SCAN": lambda p, head, direction, ds, de: c_scan_split(p.left, p.right, head, ds, de),
+    "C-LOOK": lambda p, head, direction, ds, de: c_look_split(p.left, p.right, head),
+    "SPTF": lambda p, head, direction, ds, de: _sptf(p, head),
+}
+
+
+@timed("compare_all")
+def compare_all(requests, head: int, direction: str = "right", disk_start: int = 0, disk_end: int = 199,
+                seek_model=None, algorithms: Optional[Iterable[str]] = None,
+                check: Optional[Callable[[], None]] = None) -> Dict[str, Tuple[ScheduleResult, Dict]]:
+    """
+    (result, metrics) per algorithm, in the order given (default: every registered algorithm).
+    `check` is called before each algorithm, e.g. a background job's cancellation check.
+    """
+    p = presort(requests, head)
+    out = {}
+    for name in (a.upper() for a in (algorithms or ALGORITHM_NAMES)):
+        if check is not None:
+            check()
+        build = BUILDERS.get(name)
+        res = (build(p, head, direction, disk_start, disk_end) if build is not None
+               else run_algorithm(name, p.requests, head, direction, disk_start, disk_end))
+        out[name] = res, compute_metrics(res.path, res.requests_count, seek_model=seek_model,
+                                         serviced=res.serviced_indices(), optimal=p.optimal)
+    return out
+
+
+def comparison_table(runs: Dict[str, Tuple[ScheduleResult, Dict]]) -> Dict[str, List]:
+    """Columnar view: {"algorithm": [...], <metric>: [...], ...}, one entry per algorithm."""
+    table: Dict[str, List] = {"algorithm": list(runs)}
+    for _, metrics in runs.values():
+        for key, value in metrics.items():
+            table.setdefault(key, []).append(value)
+    return table
@@ -0,0 +1,52 @@
+# diskcore/__init__.py
+"""
+Dependency-light scheduling core.
+
+    import diskcore
+    res = diskcore.run_algorithm("C-LOOK", [98, 183, 37], head=53)
+
+Importing the package loads nothing; each name is imported from its module on first
+access, and none of them pull in streamlit, pandas, plotly or pyarrow (pandas is only
+imported by ScheduleResult.to_frame/order_frame). numpy is the one required dependency.
+"""
+from importlib import import_module
+
+_EXPORTS = {
+    "ALGORITHMS": "algorithms",
+    "ALGORITHM_NAMES": "algorithms",
+    "register_algorithm": "algorithms",
+    "run_algorithm": "algorithms",
+    "ScheduleResult": "results",
+    "compute_metrics": "metrics",
+    "completion_times": "metrics",
+    "make_seek_model": "metrics",
+    "parse_seek_table": "metrics",
+    "SEEK_MODELS": "metrics",
+    "static_optimum": "oracle",
+    "windowed_optimum": "oracle",
+    "sweep": "sweep",
+    "compare_all": "compare",
+    "comparison_table": "compare",
+    "IncrementalSchedule": "incremental",
+    "DiskGeometry": "geometry",
+    "sptf_lba": "geometry",
+    "simulate_online": "online",
+    "load_trace": "traces",
+    "iter_trace": "traces",
+    "simulate_array": "raid",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'diskcore' has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return __all__
@@ -0,0 +1,97 @@
+# engine.py
+"""
+Array-backed engine for the sweep algorithms (SCAN, LOOK, C-SCAN, C-LOOK).
+Requests are sorted once, split at the head with searchsorted, and the path is
+built by concatenating the sweep segments. Head movement comes from np.diff.
+The *_split variants take an existing (left, right) split so several algorithms can
+share one sort (see compare.py).
+"""
+import numpy as np
+from results import ScheduleResult
+
+
+def split_at_head(sorted_requests: np.ndarray, head: int):
+    k = int(np.searchsorted(sorted_requests, head, side="left"))
+    return sorted_requests[:k], sorted_requests[k:]  # left (< head), right (>= head)
+
+
+def _split(requests, head: int):
+    return split_at_head(np.sort(np.asarray(requests, dtype=np.int64)), head)
+
+
+def _path(head: int, *segments) -> np.ndarray:
+    return np.concatenate([np.array([head], dtype=np.int64), *segments])
+
+
+def _movement(path: np.ndarray, jump_at: int = -1) -> int:
+    steps = np.abs(np.diff(path))
+    if jump_at > 0:
+        steps[jump_at - 1] = 0  # wrap-around jump is visual only
+    return int(steps.sum())
+
+
+def _boundary(last: int, edge: int) -> np.ndarray:
+    return np.array([edge] if last != edge else [], dtype=np.int64)
+
+
+def scan_split(left: np.ndarray, right: np.ndarray, head: int, direction: str = "right",
+               disk_start: int = 0, disk_end: int = 199) -> ScheduleResult:
+    if direction == "right":
+        first, edge, second = right, disk_end, left[::-1]
+    else:
+        first, edge, second = left[::-1], disk_start, right
+    tail = _boundary(first[-1] if first.size else head, edge)
+    path = _path(head, first, tail, second)
+    visual = [1 + first.size] if tail.size else []
+    return ScheduleResult("SCAN", path, _movement(path), visual)
+
+
+def look_split(left: np.ndarray, right: np.ndarray, head: int, direction: str = "right") -> ScheduleResult:
+    if direction == "right":
+        path = _path(head, right, left[::-1])
+    else:
+        path = _path(head, left[::-1], right)
+    return ScheduleResult("LOOK", path, _movement(path))
+
+
+def c_scan_split(left: np.ndarray, right: np.ndarray, head: int, disk_start: int = 0,
+                 disk_end: int = 199) -> ScheduleResult:
+    tail = _boundary(right[-1] if right.size else head, disk_end)
+    visual = [1 + right.size] if tail.size else []
+    if left.size:
+        jump_at = 1 + right.size + tail.size
+        path = _path(head, right, tail, np.array([disk_start], dtype=np.int64), left)
+        visual.append(jump_at)
+    else:
+        jump_at = -1
+        path = _path(head, right, tail)
+    return ScheduleResult("C-SCAN", path, _movement(path, jump_at), visual)
+
+
+def c_look_split(left: np.ndarray, right: np.ndarray, head: int) -> ScheduleResult:
+    if left.size:
+        jump_at = 1 + right.size
+        path = _path(head, right, left[:1], left)
+        visual = [jump_at]
+    else:
+        jump_at = -1
+        path = _path(head, right)
+        visual = []
+    return ScheduleResult("C-LOOK", path, _movement(path, jump_at), visual)
+
+
+def scan_array(requests, head: int, direction: str = "right",
+               disk_start: int = 0, disk_end: int = 199) -> ScheduleResult:
+    return scan_split(*_split(requests, head), head, direction, disk_start, disk_end)
+
+
+def look_array(requests, head: int, direction: str = "right") -> ScheduleResult:
+    return look_split(*_split(requests, head), head, direction)
+
+
+def c_scan_array(requests, head: int, disk_start: int = 0, disk_end: int = 199) -> ScheduleResult:
+    return c_scan_split(*_split(requests, head), head, disk_start, disk_end)
+
+
+def c_look_array(requests, head: int) -> ScheduleResult:
+    return c_look_split(*_split(requests, head), head)
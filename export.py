@@ -0,0 +1,173 @@
+# export.py
+"""
+Streaming exports of run history and head paths.
+History rows are read from SQLite in keyset-paginated chunks and paths are
+sliced from their arrays, so neither is materialised in full. CSV is written
+incrementally; Parquet and Arrow IPC (via the optional pyarrow) are written one
+compressed row group / record batch per chunk.
+"""
+import csv
+import io
+import os
+import tempfile
+from typing import Iterator, List
+import numpy as np
+from utils import HISTORY_COLUMNS, query_history
+from profiling import timed
+
+CHUNK_ROWS = 50_000
+FORMATS = ("csv", "parquet", "arrow")
+PATH_COLUMNS = ["Step", "Cylinder"]
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("pyarrow is required for Parquet/Arrow export (pip install pyarrow)") from None
+    return pa, pq
+
+
+def available_formats() -> List[str]:
+    try:
+        _pyarrow()
+    except ImportError:
+        return ["csv"]
+    return list(FORMATS)
+
+
+# --- row sources ---
+def iter_history_chunks(chunk_rows: int = CHUNK_ROWS, **filters) -> Iterator[list]:
+    before_id = None
+    while True:
+        rows = query_history(limit=chunk_rows, before_id=before_id, **filters)
+        if not rows:
+            return
+        yield rows
+        before_id = rows[-1][0]
+
+
+def iter_path_chunks(path, chunk_rows: int = CHUNK_ROWS) -> Iterator[np.ndarray]:
+    """Yield (n, 2) int64 arrays of (Step, Cylinder)."""
+    p = np.asarray(path)
+    for start in range(0, len(p), chunk_rows):
+        seg = p[start:start + chunk_rows].astype(np.int64)
+        yield np.column_stack([np.arange(start, start + len(seg)), seg])
+
+
+# --- CSV ---
+def iter_history_csv(chunk_rows: int = CHUNK_ROWS, **filters) -> Iterator[str]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(HISTORY_COLUMNS)
+    for rows in iter_history_chunks(chunk_rows, **filters):
+        writer.writerows(rows)
+        yield buf.getvalue()
+        buf.seek(0); buf.truncate()
+    yield buf.getvalue()
+
+
+def iter_path_csv(path, chunk_rows: int = CHUNK_ROWS) -> Iterator[str]:
+    yield ",".join(PATH_COLUMNS) + "\n"
+    for block in iter_path_chunks(path, chunk_rows):
+        buf = io.StringIO()
+        np.savetxt(buf, block, fmt="%d", delimiter=",")
+        yield buf.getvalue()
+
+
+def _write_text(chunks: Iterator[str], dest: str) -> str:
+    with open(dest, "w", newline="") as f:
+        for chunk in chunks:
+            f.write(chunk)
+    return dest
+
+
+# --- Parquet / Arrow ---
+HISTORY_TYPES = ["int64", "string", "string", "int64", "string", "string", "int64", "int64",
+                 "float64", "int64", "float64", "float64", "float64", "string"]
+
+
+def _history_table(rows):
+    pa, _ = _pyarrow()
+    # fixed schema, so every chunk matches the first even when a column is all NULL
+    schema = pa.schema([(name, getattr(pa, t)()) for name, t in zip(HISTORY_COLUMNS, HISTORY_TYPES)])
+    cols = list(zip(*rows)) if rows else [[] for _ in HISTORY_COLUMNS]
+    return pa.table({name: list(col) for name, col in zip(HISTORY_COLUMNS, cols)}, schema=schema)
+
+
+def _cylinder_dtype(path) -> type:
+    """int32 like ScheduleResult paths, int64 if a cylinder is out of int32 range (same for every chunk)."""
+    p = np.asarray(path)
+    if p.dtype == np.int32 or not p.size:
+        return np.int32
+    info = np.iinfo(np.int32)
+    return np.int32 if info.min <= p.min() and p.max() <= info.max else np.int64
+
+
+def _path_table(block: np.ndarray, dtype: type = np.int32):
+    pa, _ = _pyarrow()
+    return pa.table({"Step": block[:, 0], "Cylinder": block[:, 1].astype(dtype)})
+
+
+def _chain(first, rest):
+    yield first
+    yield from rest
+
+
+def _write_tables(tables, empty, dest: str, fmt: str, compression: str) -> str:
+    """Write each table as a row group / record batch; `empty` supplies the schema if there are none."""
+    pa, pq = _pyarrow()
+    writer = None
+    tables = iter(tables)
+    first = next(tables, None)
+    try:
+        for table in _chain(first if first is not None else empty(), tables):
+            if writer is None:
+                if fmt == "parquet":
+                    writer = pq.ParquetWriter(dest, table.schema, compression=compression)
+                else:
+                    options = pa.ipc.IpcWriteOptions(compression=compression)
+                    writer = pa.ipc.new_file(dest, table.schema, options=options)
+            if fmt == "parquet":
+                writer.write_table(table)
+            else:
+                writer.write(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return dest
+
+
+@timed("export")
+def export_history(dest: str, fmt: str = "csv", compression: str = "zstd",
+                   chunk_rows: int = CHUNK_ROWS, **filters) -> str:
+    if fmt == "csv":
+        return _write_text(iter_history_csv(chunk_rows, **filters), dest)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    tables = (_history_table(rows) for rows in iter_history_chunks(chunk_rows, **filters))
+    return _write_tables(tables, lambda: _history_table([]), dest, fmt, compression)
+
+
+@timed("export")
+def export_path(path, dest: str, fmt: str = "csv", compression: str = "zstd",
+                chunk_rows: int = CHUNK_ROWS) -> str:
+    if fmt == "csv":
+        return _write_text(iter_path_csv(path, chunk_rows), dest)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    dtype = _cylinder_dtype(path)
+    tables = (_path_table(b, dtype) for b in iter_path_chunks(path, chunk_rows))
+    return _write_tables(tables, lambda: _path_table(np.empty((0, 2), dtype=np.int64), dtype), dest, fmt, compression)
+
+
+def export_to_tempfile(export_fn, *args, fmt: str = "csv", **kwargs) -> str:
+    """Run export_history/export_path into a temp file and return its path."""
+    fd, dest = tempfile.mkstemp(suffix=f".{fmt}")
+    os.close(fd)
+    try:
+        return export_fn(*args, dest=dest, fmt=fmt, **kwargs)
+    except BaseException:
+        os.remove(dest)
+        raise
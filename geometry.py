@@ -0,0 +1,192 @@
+# geometry.py
+"""
+Cylinder/head/sector geometry with zoned recording and rotational position.
+Outer zones hold more sectors per track. The platter angle at time t is
+(t / rotation_ms) mod 1, so the positioning time to a request is its seek time
+plus the wait until its sector passes under the head.
+SPTF picks the request with the smallest positioning time. Pending requests sit in a
+cylinder-sorted doubly linked list, and the search walks outward from the head and
+stops once the seek time alone exceeds the best positioning time found so far.
+"""
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+from metrics import SqrtSettleSeek
+from results import ScheduleResult
+
+
+class Zone(NamedTuple):
+    first_cylinder: int
+    sectors_per_track: int
+
+
+class DiskGeometry:
+    def __init__(self, cylinders: int, heads: int, zones: Sequence[Zone], rpm: float = 7200,
+                 seek_model=None):
+        zones = sorted(zones, key=lambda z: z.first_cylinder)
+        if not zones or zones[0].first_cylinder != 0:
+            raise ValueError("Zones must start at cylinder 0")
+        self.cylinders = int(cylinders)
+        self.heads = int(heads)
+        self.rpm = float(rpm)
+        self.seek_model = seek_model if seek_model is not None else SqrtSettleSeek()
+        self.zone_first = np.array([z.first_cylinder for z in zones], dtype=np.int64)
+        self.zone_spt = np.array([z.sectors_per_track for z in zones], dtype=np.int64)
+        zone_cyls = np.diff(np.append(self.zone_first, self.cylinders))
+        sizes = zone_cyls * self.heads * self.zone_spt
+        self.zone_lba = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        self.capacity = int(sizes.sum())
+        self._seek_table = self.seek_model(np.arange(self.cylinders)).tolist()
+
+    @classmethod
+    def default(cls, cylinders: int = 200, heads: int = 4, rpm: float = 7200, zones: int = 4,
+                outer_spt: int = 500, inner_spt: int = 300, seek_model=None) -> "DiskGeometry":
+        """Evenly sized zones with sectors per track falling linearly from the outer to the inner edge."""
+        firsts = np.linspace(0, cylinders, zones, endpoint=False).astype(int)
+        spts = np.linspace(outer_spt, inner_spt, zones).astype(int)
+        return cls(cylinders, heads, [Zone(int(f), int(s)) for f, s in zip(firsts, spts)], rpm, seek_model)
+
+    @property
+    def rotation_ms(self) -> float:
+        return 60_000.0 / self.rpm
+
+    @property
+    def mean_rotational_ms(self) -> float:
+        """Expected rotational latency when the target sector is unknown: half a revolution."""
+        return self.rotation_ms / 2
+
+    def sectors_per_track(self, cylinder) -> np.ndarray:
+        zone = np.searchsorted(self.zone_first, np.asarray(cylinder, dtype=np.int64), side="right") - 1
+        return self.zone_spt[zone]
+
+    def lba_to_chs(self, lba) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized LBA -> (cylinder, head, sector)."""
+        lba = np.asarray(lba, dtype=np.int64)
+        if lba.size and (lba.min() < 0 or lba.max() >= self.capacity):
+            raise ValueError(f"LBA out of range [0, {self.capacity})")
+        zone = np.searchsorted(self.zone_lba, lba, side="right") - 1
+        spt = self.zone_spt[zone]
+        offset = lba - self.zone_lba[zone]
+        cylinder, rest = np.divmod(offset, self.heads * spt)
+        head, sector = np.divmod(rest, spt)
+        return self.zone_first[zone] + cylinder, head, sector
+
+    def angle(self, cylinder, sector) -> np.ndarray:
+        """Angular position of a sector as a fraction of a revolution."""
+        return np.asarray(sector, dtype=np.float64) / self.sectors_per_track(cylinder)
+
+    def seek_ms(self, distance: int) -> float:
+        return self._seek_table[distance] if distance < len(self._seek_table) else float(self.seek_model(distance))
+
+
+def _timeline(geometry: DiskGeometry, cylinders, angles, head: int, head_angle: float = 0.0):
+    """Per-request (seek, rotational, transfer) ms when servicing in the given order."""
+    rot = geometry.rotation_ms
+    transfer = (rot / geometry.sectors_per_track(cylinders)).tolist()
+    t = head_angle * rot
+    pos = head
+    seek, wait = [], []
+    for c, a, x in zip(cylinders.tolist(), angles.tolist(), transfer):
+        s = geometry.seek_ms(abs(c - pos))
+        w = ((a - (t + s) / rot) % 1.0) * rot
+        seek.append(s); wait.append(w)
+        t += s + w + x
+        pos = c
+    return np.array(seek), np.array(wait), np.array(transfer)
+
+
+def geometry_metrics(geometry: DiskGeometry, cylinders, angles, head: int, order=None,
+                     head_angle: float = 0.0) -> Dict:
+    """Seek / rotational / transfer breakdown for servicing requests in `order` (default: as given)."""
+    c = np.asarray(cylinders, dtype=np.int64)
+    a = np.asarray(angles, dtype=np.float64)
+    if order is not None:
+        c, a = c[order], a[order]
+    seek, wait, transfer = _timeline(geometry, c, a, head, head_angle)
+    total_ms = float(seek.sum() + wait.sum() + transfer.sum())
+    n = c.size
+    return {
+        "requests": n,
+        "mean_seek_ms": round(float(seek.mean()), 3) if n else 0,
+        "mean_rotational_ms": round(float(wait.mean()), 3) if n else 0,
+        "mean_transfer_ms": round(float(transfer.mean()), 3) if n else 0,
+        "rotational_share": round(float(wait.sum()) / total_ms, 4) if total_ms > 0 else 0,
+        "total_time_seconds": round(total_ms / 1000.0, 5),
+        "throughput_req_per_sec": round(n / (total_ms / 1000.0), 3) if total_ms > 0 else 0,
+    }
+
+
+def sptf_order(cylinders, head: int, angles=None, geometry: Optional[DiskGeometry] = None,
+               head_angle: float = 0.0) -> np.ndarray:
+    """
+    Indices of `cylinders` in SPTF service order.
+    Without angles (or geometry) positioning time is the seek distance alone, i.e. shortest seek first.
+    """
+    c = np.asarray(cylinders, dtype=np.int64)
+    n = c.size
+    rotational = angles is not None and geometry is not None
+    a = np.asarray(angles, dtype=np.float64) if rotational else np.zeros(n)
+    srt = np.lexsort((a, c))
+    cyl = c[srt].tolist()
+    ang = a[srt].tolist()
+    # doubly linked list over the sorted requests; -1 / n are the sentinels
+    prev = list(range(-1, n - 1))
+    nxt = list(range(1, n + 1))
+    if rotational:
+        rot = geometry.rotation_ms
+        transfer = (rot / geometry.sectors_per_track(c[srt])).tolist()
+        seek = geometry.seek_ms
+    else:
+        seek = float
+    right = int(np.searchsorted(c[srt], head, side="left"))
+    left = right - 1
+    pos, t = head, head_angle * (geometry.rotation_ms if rotational else 0.0)
+    visit: List[int] = []
+    for _ in range(n):
+        best, best_cost = -1, float("inf")
+        i, j = left, right
+        while i >= 0 or j < n:
+            # next candidate in seek-distance order
+            di = pos - cyl[i] if i >= 0 else None
+            dj = cyl[j] - pos if j < n else None
+            if dj is None or (di is not None and di <= dj):
+                k, d, i = i, di, prev[i]
+            else:
+                k, d, j = j, dj, nxt[j]
+            s = seek(d)
+            if s >= best_cost:
+                break  # every remaining candidate is at least this far away
+            cost = s + ((ang[k] - (t + s) / rot) % 1.0) * rot if rotational else s
+            if cost < best_cost:
+                best, best_cost = k, cost
+        visit.append(best)
+        p, q = prev[best], nxt[best]
+        if p >= 0:
+            nxt[p] = q
+        if q < n:
+            prev[q] = p
+        left, right = p, q
+        if rotational:
+            t += best_cost + transfer[best]
+        pos = cyl[best]
+    return srt[np.array(visit, dtype=np.int64)] if n else np.empty(0, dtype=np.int64)
+
+
+def sptf(requests, head: int, angles=None, geometry: Optional[DiskGeometry] = None,
+         head_angle: float = 0.0) -> ScheduleResult:
+    """Shortest Positioning Time First; seek-only unless sector angles and a geometry are given."""
+    r = np.asarray(requests, dtype=np.int64)
+    order = sptf_order(r, head, angles, geometry, head_angle)
+    path = np.concatenate([[head], r[order]])
+    return ScheduleResult("SPTF", path, int(np.abs(np.diff(path)).sum()))
+
+
+def sptf_lba(lbas, head_lba: int, geometry: DiskGeometry) -> Tuple[ScheduleResult, Dict]:
+    """SPTF over logical block addresses, with the seek/rotational breakdown of the chosen order."""
+    cyl, _, sector = geometry.lba_to_chs(lbas)
+    head_cyl, _, head_sector = geometry.lba_to_chs([head_lba])
+    angles = geometry.angle(cyl, sector)
+    head_angle = float(geometry.angle(head_cyl, head_sector)[0])
+    order = sptf_order(cyl, int(head_cyl[0]), angles, geometry, head_angle)
+    path = np.concatenate([head_cyl, cyl[order]])
+    res = ScheduleResult("SPTF", path, int(np.abs(np.diff(path)).sum()))
+    return res, geometry_metrics(geometry, cyl, angles, int(head_cyl[0]), order, head_angle)
@@ -0,0 +1,261 @@
+# incremental.py
+"""
+Incremental rescheduling for live edits of a request queue.
+An IncrementalSchedule is built in bulk (one stable argsort) and then keeps:
+- the pending cylinders as a sorted multiset of small sorted blocks, so adding or
+  removing a request costs O(log n + block size) and never shifts the whole queue;
+- arrival order as compact prev/next arrays over request ids, for O(1) unlinking.
+Totals are kept current per edit: the SCAN family from the closed-form split
+formulas in sweep.py (O(log n) per query) and FCFS by patching the legs around
+each edit. path/order, and every total of SSTF and other algorithms, are
+materialised on read in O(n): sweep paths are cut from the kept sorted order
+without re-sorting, the others re-run on the arrival order.
+"""
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, defaultdict, deque
+from itertools import chain
+from typing import Iterable, List, Optional
+import numpy as np
+from algorithms import run_algorithm
+from engine import c_look_split, c_scan_split, look_split, scan_split, split_at_head
+from results import ScheduleResult
+from sweep import split_total
+
+CLOSED_FORM = ("SCAN", "LOOK", "C-SCAN", "C-LOOK")
+# name -> builder(left, right, head, direction, disk_start, disk_end) over the sorted queue
+SPLIT_BUILDERS = {
+    "SCAN": lambda left, right, head, direction, ds, de: scan_split(left, right, head, direction, ds, de),
+    "LOOK": lambda left, right, head, direction, ds, de: look_split(left, right, head, direction),
+    "C-SCAN": lambda left, right, head, direction, ds, de: c_scan_split(left, right, head, ds, de),
+    "C-LOOK": lambda left, right, head, direction, ds, de: c_look_split(left, right, head),
+}
+BLOCK = 1024
+
+
+class SortedBlocks:
+    """Sorted multiset as a list of sorted blocks of at most 2 * BLOCK values."""
+
+    def __init__(self, sorted_values: np.ndarray = np.empty(0, dtype=np.int64)):
+        self._blocks: List[List[int]] = [sorted_values[i:i + BLOCK].tolist()
+                                         for i in range(0, len(sorted_values), BLOCK)]
+        self._maxes = [b[-1] for b in self._blocks]
+        self._len = len(sorted_values)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def add(self, value: int) -> None:
+        if not self._blocks:
+            self._blocks, self._maxes = [[value]], [value]
+        else:
+            i = min(bisect_left(self._maxes, value), len(self._maxes) - 1)
+            block = self._blocks[i]
+            insort(block, value)
+            self._maxes[i] = block[-1]
+            if len(block) > 2 * BLOCK:
+                self._blocks[i:i + 1] = [block[:BLOCK], block[BLOCK:]]
+                self._maxes[i:i + 1] = [block[BLOCK - 1], block[-1]]
+        self._len += 1
+
+    def remove(self, value: int) -> None:
+        i = bisect_left(self._maxes, value)
+        block = self._blocks[i] if i < len(self._blocks) else []
+        j = bisect_left(block, value)
+        if j == len(block) or block[j] != value:
+            raise ValueError(f"{value} is not in the set")
+        del block[j]
+        if block:
+            self._maxes[i] = block[-1]
+        else:
+            del self._blocks[i], self._maxes[i]
+        self._len -= 1
+
+    def count(self, value: int) -> int:
+        n = 0
+        for block in self._blocks[bisect_left(self._maxes, value):]:
+            if block[0] > value:
+                break
+            n += bisect_right(block, value) - bisect_left(block, value)
+        return n
+
+    def first(self) -> int:
+        return self._blocks[0][0]
+
+    def last(self) -> int:
+        return self._maxes[-1]
+
+    def below(self, value: int) -> Optional[int]:
+        """Largest value < `value`."""
+        i = bisect_left(self._maxes, value)
+        if i < len(self._blocks):
+            j = bisect_left(self._blocks[i], value)
+            if j:
+                return self._blocks[i][j - 1]
+        return self._maxes[i - 1] if i else None
+
+    def at_or_above(self, value: int) -> Optional[int]:
+        i = bisect_left(self._maxes, value)
+        if i == len(self._blocks):
+            return None
+        block = self._blocks[i]
+        return block[bisect_left(block, value)]
+
+    def to_array(self) -> np.ndarray:
+        return np.fromiter(chain.from_iterable(self._blocks), dtype=np.int64, count=self._len)
+
+
+class IncrementalSchedule:
+    def __init__(self, algorithm: str, requests: Iterable[int] = (), head: int = 0, direction: str = "right",
+                 disk_start: int = 0, disk_end: int = 199):
+        self.algorithm = algorithm.upper()
+        self.head = int(head)
+        self.direction = direction
+        self.disk_start = disk_start
+        self.disk_end = disk_end
+        r = (np.asarray(requests, dtype=np.int64) if isinstance(requests, (np.ndarray, list, tuple))
+             else np.fromiter(requests, dtype=np.int64))
+        n = r.size
+        # request id = arrival index; ids added later are appended
+        self._value = array("q", r.tobytes())
+        self._prev = array("q", np.arange(-1, n - 1, dtype=np.int64).tobytes())
+        self._next = array("q", np.append(np.arange(1, n, dtype=np.int64), -1)[:n].tobytes())
+        self._alive = bytearray(b"\x01") * n
+        self._first = 0 if n else -1
+        self._last = n - 1
+        # initial ids grouped by cylinder, oldest first; removals advance a per-cylinder cursor
+        self._by_cylinder = np.argsort(r, kind="stable")
+        self._initial_sorted = r[self._by_cylinder]
+        self._cursor = {}
+        self._added = defaultdict(deque)  # cylinder -> ids added after construction, oldest first
+        self._sorted = SortedBlocks(self._initial_sorted)
+        self._fcfs_total = int(np.abs(np.diff(r, prepend=self.head)).sum()) if n else 0
+        self._result: Optional[ScheduleResult] = None
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    # --- edits ---
+    def add(self, cylinder: int) -> None:
+        c = int(cylinder)
+        rid = len(self._value)
+        self._value.append(c)
+        self._alive.append(1)
+        self._prev.append(self._last)
+        self._next.append(-1)
+        if self._last < 0:
+            self._first = rid
+            self._fcfs_total += abs(c - self.head)
+        else:
+            self._next[self._last] = rid
+            self._fcfs_total += abs(c - self._value[self._last])
+        self._last = rid
+        self._added[c].append(rid)
+        self._sorted.add(c)
+        self._result = None
+
+    def extend(self, cylinders: Iterable[int]) -> None:
+        for c in cylinders:
+            self.add(c)
+
+    def _oldest(self, c: int) -> int:
+        lo = self._cursor.get(c)
+        if lo is None:
+            lo = int(np.searchsorted(self._initial_sorted, c, side="left"))
+        if lo < len(self._initial_sorted) and self._initial_sorted[lo] == c:
+            self._cursor[c] = lo + 1  # initial ids are older than any added one
+            return int(self._by_cylinder[lo])
+        self._cursor[c] = lo
+        added = self._added[c]
+        rid = added.popleft()
+        if not added:
+            del self._added[c]
+        return rid
+
+    def remove(self, cylinder: int) -> None:
+        """Remove the oldest pending request for `cylinder`."""
+        c = int(cylinder)
+        try:
+            self._sorted.remove(c)
+        except ValueError:
+            raise ValueError(f"No pending request for cylinder {c}") from None
+        rid = self._oldest(c)
+        self._alive[rid] = 0
+        p, q = self._prev[rid], self._next[rid]
+        before = self._value[p] if p >= 0 else self.head
+        self._fcfs_total -= abs(c - before)
+        if q >= 0:
+            after = self._value[q]
+            self._fcfs_total += abs(after - before) - abs(after - c)
+            self._prev[q] = p
+        else:
+            self._last = p
+        if p >= 0:
+            self._next[p] = q
+        else:
+            self._first = q
+        self._result = None
+
+    def apply(self, add: Iterable[int] = (), remove: Iterable[int] = ()) -> None:
+        """Add, then remove, as one edit: if any removal has no pending request, nothing changes."""
+        add = [int(c) for c in add]
+        remove = [int(c) for c in remove]
+        added = Counter(add)
+        for c, k in Counter(remove).items():
+            if self._sorted.count(c) + added[c] < k:
+                raise ValueError(f"No pending request for cylinder {c}" if k == 1
+                                 else f"Only {self._sorted.count(c) + added[c]} pending requests for cylinder {c}")
+        self.extend(add)
+        for c in remove:
+            self.remove(c)
+
+    def discard_all(self, cylinders: Iterable[int]) -> None:
+        self.apply(remove=cylinders)
+
+    def move_head(self, head: int) -> None:
+        """Change the initial head position; only the FCFS first leg and the split point change."""
+        if self._first >= 0:
+            first = self._value[self._first]
+            self._fcfs_total += abs(first - head) - abs(first - self.head)
+        self.head = int(head)
+        self._result = None
+
+    # --- views ---
+    def arrival_order(self) -> np.ndarray:
+        # ids are handed out in arrival order, so the pending ones in id order are the queue
+        values = np.frombuffer(self._value, dtype=np.int64)
+        return values[np.frombuffer(self._alive, dtype=np.uint8).view(bool)]
+
+    @property
+    def total_head_movement(self) -> int:
+        if self.algorithm == "FCFS":
+            return self._fcfs_total
+        if self.algorithm in CLOSED_FORM and len(self._sorted):
+            s, h = self._sorted, self.head
+            max_left, min_right = s.below(h), s.at_or_above(h)
+            return int(split_total(self.algorithm, self.direction, h, max_left is not None, min_right is not None,
+                                   s.first(), s.last(), max_left or 0, min_right or 0,
+                                   self.disk_start, self.disk_end))
+        return self.result().total_head_movement
+
+    def result(self) -> ScheduleResult:
+        if self._result is None:
+            build = SPLIT_BUILDERS.get(self.algorithm)
+            if build is not None:
+                left, right = split_at_head(self._sorted.to_array(), self.head)
+                self._result = build(left, right, self.head, self.direction, self.disk_start, self.disk_end)
+            else:
+                self._result = run_algorithm(self.algorithm, self.arrival_order(), self.head, self.direction,
+                                             self.disk_start, self.disk_end)
+        return self._result
+
+    @property
+    def path(self) -> np.ndarray:
+        return self.result().path
+
+    @property
+    def order(self) -> np.ndarray:
+        return self.result().order
+
+    def __repr__(self):
+        return f"IncrementalSchedule({self.algorithm}, n={len(self)}, head={self.head})"
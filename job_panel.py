@@ -0,0 +1,70 @@
+# job_panel.py
+import uuid
+from typing import Callable, Optional
+import streamlit as st
+from jobs import CANCELLED, FAILED, Job, get_job_manager
+from profiling import current_profiler
+
+SESSION_KEY = "job_session"
+RESTART_KEY = "job_restart_{}"
+POLL_SECONDS = 1.0
+
+
+def session_id() -> str:
+    if SESSION_KEY not in st.session_state:
+        st.session_state[SESSION_KEY] = uuid.uuid4().hex
+    return st.session_state[SESSION_KEY]
+
+
+def submit_job(kind: str, fn: Callable, *args, key=None, **kwargs) -> Job:
+    """Submit, or reuse the job already running / finished / cancelled for this key."""
+    restart = st.session_state.pop(RESTART_KEY.format(kind), False)
+    return get_job_manager().submit(session_id(), kind, fn, *args, key=key, restart=restart, **kwargs)
+
+
+def latest_job(kind: str) -> Optional[Job]:
+    return get_job_manager().latest(session_id(), kind)
+
+
+def _progress(job: Job, on_partial: Optional[Callable] = None):
+    if job.done:
+        st.rerun()  # full rerun so the page renders the finished result
+    c1, c2 = st.columns([5, 1])
+    if job.cancelled:
+        c1.progress(job.progress, text=f"Cancelling {job.kind}…")
+    else:
+        c1.progress(job.progress, text=job.message or f"{job.kind}: {job.status}")
+    if c2.button("✖ Cancel", key=f"cancel_job_{job.id}", disabled=job.cancelled):
+        get_job_manager().cancel(session_id(), job.id)
+        st.rerun()
+    if on_partial is not None and job.partial is not None:
+        on_partial(job.partial)
+
+
+def wait_for(job: Job, on_partial: Optional[Callable] = None, timeout: float = 0.5) -> bool:
+    """
+    True once the job has finished. Short jobs finish within `timeout`; longer ones show
+    progress, a cancel button and any partial result, polled every second while the rest
+    of the page stays interactive.
+    """
+    if job.wait(timeout):
+        prof = current_profiler()
+        if prof is not None:
+            prof.add_records([{**r, "job": job.id} for r in job.stages])
+        if job.status == FAILED:
+            st.error(f"{job.kind} failed: {job.error}")
+        elif job.status == CANCELLED:
+            c1, c2 = st.columns([5, 1])
+            c1.warning(f"{job.kind} was cancelled.")
+            # keyed jobs are resubmitted on every rerun, so restarting needs an explicit request
+            if job.key is not None and c2.button("▶ Run again", key=f"restart_job_{job.id}"):
+                st.session_state[RESTART_KEY.format(job.kind)] = True
+                st.rerun()
+        return True
+    fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+    if fragment is None:
+        _progress(job, on_partial)
+        st.button("🔄 Refresh")
+    else:
+        fragment(run_every=POLL_SECONDS)(_progress)(job, on_partial)
+    return False
@@ -0,0 +1,208 @@
+# jobs.py
+"""
+Background jobs for long simulations.
+Jobs run on a shared worker pool and are grouped by session, so a Streamlit rerun
+never blocks on a heavy run. It only reads the job's status, progress and
+(partial) result. Jobs that fan out to processes themselves (Monte Carlo, array
+simulation) run their coordinator on a pool thread. Cancellation is cooperative:
+the job function calls `ctx.check()` between units of work.
+A new job with the same session and kind replaces the previous one, and the old
+job is cancelled unless its key is identical, in which case it is reused. A job the
+user cancelled is not restarted for the same key unless `restart=True`.
+Finished jobs are dropped once superseded, and sessions idle for SESSION_TTL_SECONDS
+are forgotten, so results don't accumulate in the server process.
+Stages recorded inside a job (profiling.stage) are kept on `job.stages`.
+"""
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from profiling import Profiler
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+MAX_JOBS_PER_SESSION = 20
+SESSION_TTL_SECONDS = 30 * 60
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    __slots__ = ("id", "session", "kind", "key", "status", "progress", "message", "result", "partial",
+                 "error", "created", "finished", "stages", "_cancel", "_future")
+
+    def __init__(self, job_id: int, session: str, kind: str, key):
+        self.id = job_id
+        self.session = session
+        self.kind = kind
+        self.key = key
+        self.status = QUEUED
+        self.progress = 0.0
+        self.message = ""
+        self.result = None
+        self.partial = None
+        self.error: Optional[BaseException] = None
+        self.created = time.time()
+        self.finished: Optional[float] = None
+        self.stages: List[Dict] = []
+        self._cancel = threading.Event()
+        self._future: Optional[Future] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINISHED
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block up to `timeout` seconds; True if the job has finished."""
+        if self._future is not None:
+            try:
+                self._future.exception(timeout=timeout)
+            except Exception:
+                pass
+        return self.done
+
+    # --- used by the job function ---
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def check(self) -> None:
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def report(self, progress: float, message: str = "", partial=None) -> None:
+        self.check()
+        self.progress = min(max(float(progress), 0.0), 1.0)
+        self.message = message
+        if partial is not None:
+            self.partial = partial
+
+    def __repr__(self):
+        return f"Job({self.id}, {self.kind!r}, {self.status}, {self.progress:.0%})"
+
+
+class JobManager:
+    def __init__(self, max_workers: Optional[int] = None):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers or min(8, os.cpu_count() or 1),
+                                        thread_name_prefix="sim-job")
+        self._jobs: Dict[str, List[Job]] = {}
+        self._seen: Dict[str, float] = {}  # session -> last submit/lookup time
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def submit(self, session: str, kind: str, fn: Callable, *args, key=None, restart: bool = False, **kwargs) -> Job:
+        """Run fn(job, *args, **kwargs) in the background and return its Job."""
+        with self._lock:
+            self._touch(session)
+            jobs = self._jobs.setdefault(session, [])
+            latest = self._latest(jobs, kind)
+            if key is not None and latest is not None and latest.key == key and not restart \
+                    and latest.status != FAILED:
+                return latest  # queued, running, done or cancelled by the user: don't start it again
+            for old in jobs:
+                if old.kind == kind and not old.done:
+                    self._cancel(old)
+            # superseded finished jobs of this kind only hold memory
+            jobs[:] = [j for j in jobs if j.kind != kind or not j.done]
+            job = Job(next(self._ids), session, kind, key)
+            jobs.append(job)
+            del jobs[:-MAX_JOBS_PER_SESSION]
+            job._future = self._pool.submit(self._run, job, fn, args, kwargs)
+            return job
+
+    def _run(self, job: Job, fn: Callable, args, kwargs):
+        if job.cancelled:
+            job.status = CANCELLED
+            job.finished = time.time()
+            return
+        job.status = RUNNING
+        # the submitting script's profiler is not visible in this thread; record on the job instead
+        prof = Profiler(f"job:{job.kind}")
+        try:
+            with prof, prof.stage(f"job {job.kind}"):
+                job.result = fn(job, *args, **kwargs)
+            job.progress = 1.0
+            job.status = CANCELLED if job.cancelled else DONE
+        except JobCancelled:
+            job.status = CANCELLED
+        except Exception as e:
+            job.error = e
+            job.status = FAILED
+        finally:
+            job.stages = prof.summary()
+            job.finished = time.time()
+
+    @staticmethod
+    def _cancel(job: Job) -> None:
+        job._cancel.set()
+        if job._future is not None and job._future.cancel():
+            job.status = CANCELLED
+            job.finished = time.time()
+
+    @staticmethod
+    def _latest(jobs: List[Job], kind: str) -> Optional[Job]:
+        for job in reversed(jobs):
+            if job.kind == kind:
+                return job
+        return None
+
+    def _touch(self, session: str) -> None:
+        now = time.time()
+        self._seen[session] = now
+        for idle in [s for s, seen in self._seen.items() if now - seen > SESSION_TTL_SECONDS]:
+            for job in self._jobs.pop(idle, []):
+                self._cancel(job)
+            del self._seen[idle]
+
+    def latest(self, session: str, kind: str) -> Optional[Job]:
+        with self._lock:
+            self._touch(session)
+            return self._latest(self._jobs.get(session, []), kind)
+
+    def jobs(self, session: str) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.get(session, []))
+
+    def cancel(self, session: str, job_id: Optional[int] = None, kind: Optional[str] = None) -> None:
+        """Cancel one job, all jobs of a kind, or every unfinished job of the session."""
+        with self._lock:
+            for job in self._jobs.get(session, []):
+                if not job.done and (job_id is None or job.id == job_id) and (kind is None or job.kind == kind):
+                    self._cancel(job)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            for jobs in self._jobs.values():
+                for job in jobs:
+                    self._cancel(job)
+        self._pool.shutdown(wait=False)
+
+
+def process_pool(max_workers: Optional[int] = None, initializer: Optional[Callable] = None):
+    """
+    ProcessPoolExecutor whose workers are not forked from this process. The Streamlit
+    server and the job pool are multithreaded, and forking a multithreaded process
+    can deadlock a child on a lock some other thread held at fork time.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(method),
+                               initializer=initializer)
+
+
+_manager: Optional[JobManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """One worker pool per server process, shared by all sessions."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager()
+        return _manager
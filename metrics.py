@@ -0,0 +1,160 @@
+# metrics.py
+"""
+Vectorized disk metrics.
+Seek time is a pluggable curve over seek distance (linear, sqrt-plus-settle, or
+piecewise-linear from a measured table). Per-request service and wait times are
+derived from the cumulative seek time along the head path.
+"""
+from typing import Dict, Optional, Sequence, Tuple
+import numpy as np
+from oracle import efficiency, static_optimum
+
+PERCENTILES = (50, 95, 99)
+
+
+# --- seek curves: distance (cylinders) -> time (ms) ---
+class LinearSeek:
+    kind = "linear"
+
+    def __init__(self, ms_per_cylinder: float = 1.0):
+        self.ms_per_cylinder = float(ms_per_cylinder)
+
+    def __call__(self, distance: np.ndarray) -> np.ndarray:
+        return np.asarray(distance, dtype=np.float64) * self.ms_per_cylinder
+
+    def spec(self) -> Dict:
+        return {"kind": self.kind, "ms_per_cylinder": self.ms_per_cylinder}
+
+
+class SqrtSettleSeek:
+    """settle + coeff * sqrt(d) for any non-zero seek (short-seek acceleration model)."""
+    kind = "sqrt"
+
+    def __init__(self, settle_ms: float = 1.0, sqrt_ms: float = 0.3):
+        self.settle_ms = float(settle_ms)
+        self.sqrt_ms = float(sqrt_ms)
+
+    def __call__(self, distance: np.ndarray) -> np.ndarray:
+        d = np.asarray(distance, dtype=np.float64)
+        return np.where(d > 0, self.settle_ms + self.sqrt_ms * np.sqrt(d), 0.0)
+
+    def spec(self) -> Dict:
+        return {"kind": self.kind, "settle_ms": self.settle_ms, "sqrt_ms": self.sqrt_ms}
+
+
+class PiecewiseSeek:
+    """Linear interpolation over a measured (distance, ms) table, extrapolated past the last point."""
+    kind = "piecewise"
+
+    def __init__(self, distances: Sequence[float], times_ms: Sequence[float]):
+        d = np.asarray(distances, dtype=np.float64)
+        t = np.asarray(times_ms, dtype=np.float64)
+        if d.size < 2 or d.size != t.size:
+            raise ValueError("Piecewise seek table needs at least two (distance, ms) points")
+        idx = np.argsort(d)
+        self.distances, self.times_ms = d[idx], t[idx]
+
+    def __call__(self, distance: np.ndarray) -> np.ndarray:
+        shape = np.shape(distance)  # scalars too: the online simulator seeks one request at a time
+        d = np.atleast_1d(np.asarray(distance, dtype=np.float64))
+        slope = (self.times_ms[-1] - self.times_ms[-2]) / max(self.distances[-1] - self.distances[-2], 1e-12)
+        out = np.where(d > self.distances[-1], self.times_ms[-1] + (d - self.distances[-1]) * slope,
+                       np.interp(d, self.distances, self.times_ms))
+        return np.where(d > 0, out, 0.0).reshape(shape)
+
+    def spec(self) -> Dict:
+        return {"kind": self.kind, "distances": self.distances.tolist(), "times_ms": self.times_ms.tolist()}
+
+
+SEEK_MODELS = {
+    LinearSeek.kind: LinearSeek,
+    SqrtSettleSeek.kind: SqrtSettleSeek,
+    PiecewiseSeek.kind: PiecewiseSeek,
+}
+
+
+def make_seek_model(spec: Optional[Dict] = None, seek_time_per_cylinder_ms: float = 1.0):
+    """Build a seek curve from a spec dict like {"kind": "sqrt", "settle_ms": 2}."""
+    if not spec:
+        return LinearSeek(seek_time_per_cylinder_ms)
+    params = dict(spec)
+    kind = params.pop("kind", "linear")
+    if kind not in SEEK_MODELS:
+        raise ValueError(f"Unknown seek model: {kind}")
+    return SEEK_MODELS[kind](**params)
+
+
+def parse_seek_table(text: str) -> PiecewiseSeek:
+    """Parse "distance:ms, distance:ms, ..." into a PiecewiseSeek."""
+    points = []
+    for part in text.replace(";", ",").split(","):
+        if part.strip():
+            d, _, t = part.partition(":")
+            try:
+                points.append((float(d), float(t)))
+            except ValueError:
+                raise ValueError(f"Invalid seek table entry: {part.strip()}") from None
+    return PiecewiseSeek([d for d, _ in points], [t for _, t in points])
+
+
+def _pct(values: np.ndarray, prefix: str) -> Dict:
+    if not values.size:
+        return {f"{prefix}_p{p}_ms": 0 for p in PERCENTILES}
+    qs = np.percentile(values, PERCENTILES)
+    return {f"{prefix}_p{p}_ms": round(float(q), 3) for p, q in zip(PERCENTILES, qs)}
+
+
+def completion_times(path, seek_model=None, serviced: Optional[np.ndarray] = None,
+                     rotational_latency_ms: float = 0.0) -> Tuple[np.ndarray, float]:
+    """Completion time (ms) of each serviced path index, and the time the whole path takes."""
+    model = seek_model if seek_model is not None else LinearSeek()
+    p = np.asarray(path, dtype=np.int64)
+    idx = np.arange(1, len(p)) if serviced is None else np.asarray(serviced, dtype=np.int64)
+    step_ms = model(np.abs(np.diff(p)))
+    if rotational_latency_ms:
+        step_ms[idx - 1] += rotational_latency_ms
+    elapsed = np.cumsum(step_ms)  # elapsed[i] = time the head reaches (and services) path[i + 1]
+    total_ms = float(elapsed[-1]) if elapsed.size else 0.0
+    return (elapsed[idx - 1] if idx.size else np.empty(0)), total_ms
+
+
+def compute_metrics(path, requests_count: int, seek_model=None, seek_time_per_cylinder_ms: float = 1.0,
+                    serviced: Optional[np.ndarray] = None, rotational_latency_ms: float = 0.0,
+                    optimal: Optional[int] = None) -> Dict:
+    """
+    Metrics for a head path. `serviced` holds the path indices that are real requests
+    (default: every point after the start); the others are sweep/wrap points whose
+    travel time is charged to the next serviced request. All requests arrive at t=0.
+    `rotational_latency_ms` is added to every serviced request (e.g. half a revolution,
+    see geometry.DiskGeometry.mean_rotational_ms). `optimal` skips recomputing the static
+    optimum when the caller already has it for this request set.
+    """
+    model = seek_model if seek_model is not None else LinearSeek(seek_time_per_cylinder_ms)
+    p = np.asarray(path, dtype=np.int64)
+    total_movement = int(np.abs(np.diff(p)).sum())
+    idx = np.arange(1, len(p)) if serviced is None else np.asarray(serviced, dtype=np.int64)
+    wait, total_ms = completion_times(p, model, idx, rotational_latency_ms)
+    service = np.diff(wait, prepend=0.0)
+
+    avg_seek = total_movement / requests_count if requests_count > 0 else 0
+    total_time_seconds = total_ms / 1000.0
+    throughput = (requests_count / total_time_seconds) if total_time_seconds > 0 else 0
+    mean_wait = float(wait.mean()) if wait.size else 0.0
+    max_wait = float(wait.max()) if wait.size else 0.0
+    if optimal is None:
+        optimal = static_optimum(p[idx], int(p[0])) if p.size else 0
+    return {
+        "total_head_movement": total_movement,
+        "average_seek_distance": round(avg_seek, 3),
+        "total_time_seconds": round(total_time_seconds, 5),
+        "throughput_req_per_sec": round(throughput, 3),
+        "mean_service_ms": round(float(service.mean()) if service.size else 0.0, 3),
+        **_pct(service, "service"),
+        "mean_wait_ms": round(mean_wait, 3),
+        **_pct(wait, "wait"),
+        "max_wait_ms": round(max_wait, 3),
+        # how much longer the worst-served request waits than the average one
+        "starvation_ratio": round(max_wait / mean_wait, 3) if mean_wait > 0 else 0,
+        "optimal_head_movement": optimal,
+        "efficiency": efficiency(total_movement, optimal),
+    }
@@ -0,0 +1,122 @@
+# montecarlo.py
+"""
+Monte Carlo evaluation over synthetic workloads.
+Each sample draws a seeded workload and a random initial head, then runs every
+selected algorithm on it. Samples are split into chunks evaluated on a process
+pool; per-chunk statistics are merged as chunks complete (Chan et al.'s parallel
+variance update), so aggregated results can be streamed while the run continues.
+"""
+import math
+import os
+from concurrent.futures import as_completed
+from typing import Dict, Iterator, List, Optional, Sequence
+import numpy as np
+from algorithms import run_algorithm
+from jobs import process_pool
+from metrics import make_seek_model
+from workloads import WORKLOADS
+
+Z_95 = 1.959964
+
+
+class RunningStats:
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0):
+        self.count, self.mean, self.m2 = count, mean, m2
+
+    @classmethod
+    def from_values(cls, values) -> "RunningStats":
+        v = np.asarray(values, dtype=np.float64)
+        if not v.size:
+            return cls()
+        return cls(int(v.size), float(v.mean()), float(((v - v.mean()) ** 2).sum()))
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            return self
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / n
+        self.m2 += other.m2 + delta * delta * self.count * other.count / n
+        self.count = n
+        return self
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def ci95(self):
+        half = Z_95 * math.sqrt(self.variance / self.count) if self.count > 1 else 0.0
+        return self.mean - half, self.mean + half
+
+    def as_tuple(self):
+        return self.count, self.mean, self.m2
+
+
+def evaluate_chunk(workload: str, algorithms: Sequence[str], n_requests: int, seeds: Sequence,
+                   direction: str, disk_start: int, disk_end: int, seek_model_spec: Optional[Dict]) -> Dict:
+    """Run one chunk of samples; returns {algorithm: {metric: (count, mean, m2)}}."""
+    seek_model = make_seek_model(seek_model_spec)
+    generate = WORKLOADS[workload]
+    movement = {a: [] for a in algorithms}
+    throughput = {a: [] for a in algorithms}
+    for seed in seeds:
+        rng = np.random.default_rng(seed)
+        requests = generate(n_requests, rng, disk_start, disk_end)
+        head = int(rng.integers(disk_start, disk_end + 1))
+        for a in algorithms:
+            m = run_algorithm(a, requests, head, direction, disk_start, disk_end).metrics(seek_model=seek_model)
+            movement[a].append(m["total_head_movement"])
+            throughput[a].append(m["throughput_req_per_sec"])
+    return {a: {"movement": RunningStats.from_values(movement[a]).as_tuple(),
+                "throughput": RunningStats.from_values(throughput[a]).as_tuple()} for a in algorithms}
+
+
+def summarize(workload: str, stats: Dict[str, Dict[str, RunningStats]]) -> List[Dict]:
+    rows = []
+    for a, s in stats.items():
+        mv, tp = s["movement"], s["throughput"]
+        (mv_lo, mv_hi), (tp_lo, tp_hi) = mv.ci95(), tp.ci95()
+        rows.append({"workload": workload, "algorithm": a, "samples": mv.count,
+                     "mean_movement": round(mv.mean, 3), "var_movement": round(mv.variance, 3),
+                     "ci95_movement_low": round(mv_lo, 3), "ci95_movement_high": round(mv_hi, 3),
+                     "mean_throughput": round(tp.mean, 3), "var_throughput": round(tp.variance, 3),
+                     "ci95_throughput_low": round(tp_lo, 3), "ci95_throughput_high": round(tp_hi, 3)})
+    return rows
+
+
+def run_monte_carlo(workload: str, algorithms: Sequence[str], samples: int = 1000, n_requests: int = 100,
+                    seed: int = 0, direction: str = "right", disk_start: int = 0, disk_end: int = 199,
+                    seek_model_spec: Optional[Dict] = None, chunk_size: int = 50,
+                    workers: Optional[int] = None) -> Iterator[List[Dict]]:
+    """Yield the aggregated summary rows after every completed chunk; the last yield is final."""
+    if workload not in WORKLOADS:
+        raise ValueError(f"Unknown workload: {workload}")
+    seeds = np.random.SeedSequence(seed).spawn(samples)
+    chunks = [seeds[i:i + chunk_size] for i in range(0, samples, chunk_size)]
+    stats = {a: {"movement": RunningStats(), "throughput": RunningStats()} for a in algorithms}
+    args = (direction, disk_start, disk_end, seek_model_spec)
+
+    def fold(result):
+        for a, metrics in result.items():
+            for k, t in metrics.items():
+                stats[a][k].merge(RunningStats(*t))
+        return summarize(workload, stats)
+
+    if workers == 1 or len(chunks) == 1:
+        for chunk in chunks:
+            yield fold(evaluate_chunk(workload, algorithms, n_requests, chunk, *args))
+        return
+    with process_pool(workers or os.cpu_count()) as pool:
+        futures = [pool.submit(evaluate_chunk, workload, list(algorithms), n_requests, chunk, *args) for chunk in chunks]
+        try:
+            for fut in as_completed(futures):
+                yield fold(fut.result())
+        finally:
+            # consumer stopped early (e.g. a cancelled job): drop chunks that have not started
+            for fut in futures:
+                fut.cancel()
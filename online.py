@@ -0,0 +1,235 @@
+# online.py
+"""
+Event-driven online scheduling.
+Requests arrive as (arrival_time_ms, cylinder) tuples while the head is moving.
+A heap-based event queue orders arrivals and head dispatches; the policy only sees
+requests that have already arrived. Serviced requests are yielded as they complete,
+and arrivals are pulled lazily from the input iterator.
+"""
+import heapq
+from bisect import bisect_left, insort
+from collections import deque
+from typing import Dict, Iterable, Iterator, NamedTuple, Tuple
+from metrics import LinearSeek
+
+ARRIVAL, DISPATCH = 0, 1  # arrivals at the same instant are queued before the head picks
+
+
+class ServicedEvent(NamedTuple):
+    time_ms: float
+    arrival_ms: float
+    cylinder: int
+    seek_distance: int
+    wait_ms: float
+    head_movement: int  # cumulative, includes sweeps to the disk edge
+
+
+class _Pending(NamedTuple):
+    cylinder: int
+    seq: int
+    arrival_ms: float
+
+
+# --- online policies ---
+# next_move(pos) returns (target, counted, request) where request is None for
+# non-servicing moves (sweep to the disk edge, C-SCAN wrap), or None when idle.
+
+class _FCFSQueue:
+    def __init__(self, **_):
+        self._q = deque()
+
+    def __len__(self):
+        return len(self._q)
+
+    def push(self, req: _Pending):
+        self._q.append(req)
+
+    def next_move(self, pos: int):
+        if not self._q:
+            return None
+        req = self._q.popleft()
+        return req.cylinder, True, req
+
+
+class _SortedQueue:
+    def __init__(self, direction: str = "right", disk_start: int = 0, disk_end: int = 199):
+        self._q = []
+        self.direction = direction
+        self.disk_start = disk_start
+        self.disk_end = disk_end
+
+    def __len__(self):
+        return len(self._q)
+
+    def push(self, req: _Pending):
+        insort(self._q, req)
+
+    def _at_or_above(self, pos: int):
+        i = bisect_left(self._q, (pos,))
+        return i if i < len(self._q) else None
+
+    def _at_or_below(self, pos: int):
+        j = bisect_left(self._q, (pos + 1,)) - 1
+        if j < 0:
+            return None
+        return bisect_left(self._q, (self._q[j].cylinder,))  # earliest arrival on that cylinder
+
+    def _take(self, i: int, counted: bool = True):
+        req = self._q.pop(i)
+        return req.cylinder, counted, req
+
+    def _ahead(self, pos: int):
+        return self._at_or_above(pos) if self.direction == "right" else self._at_or_below(pos)
+
+
+class _SSTFQueue(_SortedQueue):
+    def next_move(self, pos: int):
+        if not self._q:
+            return None
+        lo, hi = self._at_or_below(pos), self._at_or_above(pos)
+        if lo is None or hi is None:
+            return self._take(hi if lo is None else lo)
+        d_lo, d_hi = pos - self._q[lo].cylinder, self._q[hi].cylinder - pos
+        if d_lo != d_hi:
+            return self._take(lo if d_lo < d_hi else hi)
+        return self._take(lo if self._q[lo].seq < self._q[hi].seq else hi)
+
+
+class _LOOKQueue(_SortedQueue):
+    def next_move(self, pos: int):
+        if not self._q:
+            return None
+        i = self._ahead(pos)
+        if i is None:
+            self.direction = "left" if self.direction == "right" else "right"
+            i = self._ahead(pos)
+        return self._take(i)
+
+
+class _SCANQueue(_SortedQueue):
+    def next_move(self, pos: int):
+        if not self._q:
+            return None
+        i = self._ahead(pos)
+        if i is not None:
+            return self._take(i)
+        edge = self.disk_end if self.direction == "right" else self.disk_start
+        self.direction = "left" if self.direction == "right" else "right"
+        if pos != edge:
+            return edge, True, None
+        return self._take(self._ahead(pos))
+
+
+class _CSCANQueue(_SortedQueue):
+    def next_move(self, pos: int):
+        if not self._q:
+            return None
+        i = self._at_or_above(pos)
+        if i is not None:
+            return self._take(i)
+        if pos != self.disk_end:
+            return self.disk_end, True, None
+        return self.disk_start, False, None  # wrap-around jump is visual only
+
+
+class _CLOOKQueue(_SortedQueue):
+    def next_move(self, pos: int):
+        if not self._q:
+            return None
+        i = self._at_or_above(pos)
+        if i is not None:
+            return self._take(i)
+        return self._take(0, counted=False)  # jump to the lowest pending request
+
+
+POLICIES = {
+    "FCFS": _FCFSQueue,
+    "SSTF": _SSTFQueue,
+    "SCAN": _SCANQueue,
+    "LOOK": _LOOKQueue,
+    "C-SCAN": _CSCANQueue,
+    "C-LOOK": _CLOOKQueue,
+}
+
+
+def simulate_online(arrivals: Iterable[Tuple[float, int]], policy: str, head: int,
+                    direction: str = "right", disk_start: int = 0, disk_end: int = 199,
+                    seek_time_per_cylinder_ms: float = 1.0, seek_model=None) -> Iterator[ServicedEvent]:
+    """Yield a ServicedEvent per request, in completion order.
+
+    `arrivals` must be sorted by arrival time. Seek time uses the same curves as
+    compute_disk_metrics (linear per-cylinder unless `seek_model` is given).
+    """
+    model = seek_model if seek_model is not None else LinearSeek(seek_time_per_cylinder_ms)
+    name = policy.upper()
+    if name not in POLICIES:
+        raise ValueError(f"Unknown algorithm: {policy}")
+    queue = POLICIES[name](direction=direction, disk_start=disk_start, disk_end=disk_end)
+    source = iter(arrivals)
+    events = []
+    seq = 0
+    last_arrival = float("-inf")
+
+    def pull_arrival():
+        nonlocal seq, last_arrival
+        nxt = next(source, None)
+        if nxt is None:
+            return
+        t, cyl = float(nxt[0]), int(nxt[1])
+        if t < last_arrival:
+            raise ValueError(f"Arrivals must be sorted by time (got {t} after {last_arrival})")
+        last_arrival = t
+        heapq.heappush(events, (t, ARRIVAL, seq, _Pending(cyl, seq, t)))
+        seq += 1
+
+    pull_arrival()
+    pos = head
+    movement = 0
+    busy = False
+    while events:
+        now, kind, _, payload = heapq.heappop(events)
+        if kind == ARRIVAL:
+            queue.push(payload)
+            pull_arrival()
+            if not busy:
+                busy = True
+                heapq.heappush(events, (now, DISPATCH, payload.seq, None))
+            continue
+        if payload is not None:
+            req, dist = payload
+            yield ServicedEvent(now, req.arrival_ms, req.cylinder, dist, now - req.arrival_ms, movement)
+        move = queue.next_move(pos)
+        if move is None:
+            busy = False
+            continue
+        target, counted, req = move
+        dist = abs(target - pos) if counted else 0
+        pos = target
+        movement += dist
+        done = now + float(model(dist))
+        heapq.heappush(events, (done, DISPATCH, seq, (req, dist) if req is not None else None))
+        seq += 1
+
+
+def summarize_online(events: Iterable[ServicedEvent]) -> Dict:
+    """Fold a stream of ServicedEvents into aggregate metrics in constant memory."""
+    count = 0
+    wait_sum = 0.0
+    max_wait = 0.0
+    movement = 0
+    finish = 0.0
+    for ev in events:
+        count += 1
+        wait_sum += ev.wait_ms
+        max_wait = max(max_wait, ev.wait_ms)
+        movement = ev.head_movement
+        finish = ev.time_ms
+    seconds = finish / 1000.0
+    return {
+        "requests": count,
+        "total_head_movement": int(movement),
+        "average_wait_ms": round(wait_sum / count, 3) if count else 0,
+        "max_wait_ms": round(max_wait, 3),
+        "makespan_seconds": round(seconds, 5),
+        "throughput_req_per_sec": round(count / seconds, 3) if seconds > 0 else 0,
+    }
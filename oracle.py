@@ -0,0 +1,93 @@
+# oracle.py
+"""
+Optimal-movement oracle.
+Static case (every request pending at t=0): an optimal route on a line goes to the
+nearer end of the request span first and then sweeps to the other end, so the
+minimum movement is L + R + min(L, R) with L/R the distances to the extreme
+requests on each side.
+With arrival times and/or deadlines, `windowed_optimum` runs an interval DP: after
+any prefix of an optimal route the visited cylinders form a contiguous run of
+the sorted requests around the head, ending at its left or right end. Tables are
+filled one diagonal (interval length) at a time with numpy, in O(n^2) time and
+O(n) memory.
+"""
+from typing import Dict, Optional, Sequence
+import numpy as np
+
+
+def static_optimum(requests, head: int) -> int:
+    """Minimum total head movement to service all requests, in O(n)."""
+    r = np.asarray(requests, dtype=np.int64)
+    if not r.size:
+        return 0
+    left = max(head - int(r.min()), 0)
+    right = max(int(r.max()) - head, 0)
+    return left + right + min(left, right)
+
+
+def efficiency(total_movement: int, optimal_movement: int) -> float:
+    """optimal / actual movement: 1.0 is optimal, lower is worse."""
+    return round(optimal_movement / total_movement, 4) if total_movement > 0 else 1.0
+
+
+def windowed_optimum(requests: Sequence[int], head: int, arrival_ms: Optional[Sequence[float]] = None,
+                     deadline_ms: Optional[Sequence[float]] = None, ms_per_cylinder: float = 1.0) -> Dict:
+    """
+    Fastest route that services each request at or after its arrival and by its deadline.
+    The head moves at `ms_per_cylinder` and may wait in place. Returns completion time,
+    the head movement of that route and whether all deadlines can be met.
+    With deadlines only (no waiting) minimum time is minimum movement, and the DP is exact.
+    With arrival times it is optimal over zigzag schedules that never pass a pending
+    request without servicing it, so its completion time is an upper bound.
+    """
+    r = np.asarray(requests, dtype=np.int64)
+    n = r.size
+    if not n:
+        return {"completion_ms": 0.0, "movement": 0, "feasible": True}
+    rel = np.zeros(n) if arrival_ms is None else np.asarray(arrival_ms, dtype=float)
+    due = np.full(n, np.inf) if deadline_ms is None else np.asarray(deadline_ms, dtype=float)
+    # the head is point 0 of the sorted sequence: released at 0, no deadline
+    order = np.argsort(r, kind="stable")
+    pos = np.concatenate([[head], r[order]])
+    rel = np.concatenate([[0.0], rel[order]])
+    due = np.concatenate([[np.inf], due[order]])
+    order = np.argsort(pos, kind="stable")
+    pos, rel, due = pos[order], rel[order], due[order]
+    h = int(np.flatnonzero(order == 0)[0])
+    m = n + 1
+    speed = float(ms_per_cylinder)
+
+    # t_at_left[l] / t_at_right[l]: time to cover [l, l + length - 1], standing at its left/right end
+    t_left = np.full(m, np.inf)
+    t_right = np.full(m, np.inf)
+    t_left[h] = t_right[h] = 0.0
+    mv_left = np.zeros(m, dtype=np.int64)
+    mv_right = np.zeros(m, dtype=np.int64)
+    for length in range(2, m + 1):
+        count = m - length + 1
+        l = np.arange(count)
+        rr = l + length - 1
+        # extend to the left: from [l+1, rr], standing at l+1 or at rr
+        a = t_left[1:count + 1] + (pos[l + 1] - pos[l]) * speed
+        b = t_right[1:count + 1] + (pos[rr] - pos[l]) * speed
+        take_a = a <= b
+        new_t_left = np.maximum(np.where(take_a, a, b), rel[l])
+        new_mv_left = np.where(take_a, mv_left[1:count + 1] + (pos[l + 1] - pos[l]),
+                               mv_right[1:count + 1] + (pos[rr] - pos[l]))
+        new_t_left[new_t_left > due[l]] = np.inf
+        # extend to the right: from [l, rr-1], standing at rr-1 or at l
+        c = t_right[:count] + (pos[rr] - pos[rr - 1]) * speed
+        d = t_left[:count] + (pos[rr] - pos[l]) * speed
+        take_c = c <= d
+        new_t_right = np.maximum(np.where(take_c, c, d), rel[rr])
+        new_mv_right = np.where(take_c, mv_right[:count] + (pos[rr] - pos[rr - 1]),
+                                mv_left[:count] + (pos[rr] - pos[l]))
+        new_t_right[new_t_right > due[rr]] = np.inf
+        t_left, t_right, mv_left, mv_right = new_t_left, new_t_right, new_mv_left, new_mv_right
+    if t_left[0] <= t_right[0]:
+        best, movement = t_left[0], mv_left[0]
+    else:
+        best, movement = t_right[0], mv_right[0]
+    if not np.isfinite(best):
+        return {"completion_ms": float("inf"), "movement": None, "feasible": False}
+    return {"completion_ms": round(float(best), 3), "movement": int(movement), "feasible": True}
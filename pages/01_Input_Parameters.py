@@ -1,6 +1,11 @@
 # pages/01_Input_Parameters.py
+import os
 import streamlit as st
+from algorithms import ALGORITHM_NAMES
 from utils import parse_requests
+from metrics import parse_seek_table
+from traces import FORMATS, TRACE_DIR, load_trace, resolve_trace_path, spool_to_tempfile
+from profiling import Profiler
 
 st.set_page_config(page_title="Input Parameters", layout="wide")
 
@@ -8,21 +13,56 @@ st.title("⚙️ Input Parameters")
 
 with st.form("input_form"):
     req_text = st.text_area("Enter Disk Requests (comma or space separated):", placeholder="98, 183, 37, 122, 14, 124, 65, 67")
+    trace_file = st.file_uploader("Or upload a trace file (CSV, whitespace, blktrace, fio iolog):")
+    trace_path = ""
+    if TRACE_DIR:
+        trace_path = st.text_input("Or name of a trace file in the server's trace directory (for traces over the upload limit):",
+                                   value="")
+    trace_fmt = st.selectbox("Trace format:", ["auto", *FORMATS])
+    trace_column = st.number_input("CSV column holding the cylinders (0-based, -1 = single-column file):",
+                                   min_value=-1, value=-1, step=1)
+    sectors_per_cyl = st.number_input("Sectors per cylinder (blktrace/fio):", min_value=1, value=1008, step=1)
     head = st.number_input("Initial Head Position:", min_value=0, value=50, step=1)
-    algo = st.selectbox("Choose Algorithm:", ["FCFS", "SSTF", "SCAN", "LOOK", "C-SCAN", "C-LOOK", "COMPARE ALL"])
+    algo = st.selectbox("Choose Algorithm:", [*ALGORITHM_NAMES, "COMPARE ALL"])
     direction = st.selectbox("Direction (for SCAN/LOOK):", ["right", "left"])
     disk_start = st.number_input("Disk Start Cylinder:", value=0, step=1)
     disk_end = st.number_input("Disk End Cylinder:", value=199, step=1)
     seek_time_ms = st.number_input("Seek time per cylinder (ms):", value=1.0, step=0.1)
+    seek_kind = st.selectbox("Seek-time curve:", ["linear", "sqrt", "piecewise"])
+    settle_ms = st.number_input("Settle time (ms, sqrt curve):", value=1.0, step=0.1)
+    sqrt_ms = st.number_input("sqrt(distance) coefficient (ms, sqrt curve):", value=0.3, step=0.05)
+    seek_table = st.text_input("Measured seek table as distance:ms (piecewise curve):", value="1:1.0, 50:4.0, 200:10.0")
     animate = st.checkbox("Animate head movement in Simulation", value=True)
-    anim_speed = st.slider("Animation speed (sec per step)", 0.05, 1.0, 0.25, 0.05)
+    anim_speed = st.slider("Animation speed (sec per frame)", 0.05, 1.0, 0.25, 0.05)
     save_name = st.text_input("Optional: Save run as (name):", value="")
     submitted = st.form_submit_button("➡️ Proceed to Simulation")
 
 if submitted:
     try:
-        requests = parse_requests(req_text)
-        if not requests:
+        with Profiler("input") as prof:
+            trace_options = {"fmt": trace_fmt, "sectors_per_cylinder": int(sectors_per_cyl),
+                             "column": int(trace_column) if trace_column >= 0 else None}
+            if trace_path.strip():
+                # read in place: the file never passes through the upload buffer
+                requests = load_trace(resolve_trace_path(trace_path.strip()), **trace_options)
+                req_text = f"trace:{os.path.basename(trace_path.strip())} ({len(requests)} requests)"
+            elif trace_file is not None:
+                # spool to disk and mmap-parse, instead of decoding the upload to text
+                tmp_path = spool_to_tempfile(trace_file, suffix=os.path.splitext(trace_file.name)[1])
+                try:
+                    requests = load_trace(tmp_path, **trace_options)
+                finally:
+                    os.remove(tmp_path)
+                req_text = f"trace:{trace_file.name} ({len(requests)} requests)"
+            else:
+                requests = parse_requests(req_text)
+        if seek_kind == "sqrt":
+            seek_model = {"kind": "sqrt", "settle_ms": float(settle_ms), "sqrt_ms": float(sqrt_ms)}
+        elif seek_kind == "piecewise":
+            seek_model = parse_seek_table(seek_table).spec()
+        else:
+            seek_model = {"kind": "linear", "ms_per_cylinder": float(seek_time_ms)}
+        if len(requests) == 0:
             st.error("Please enter at least one valid request.")
         else:
             # store in session state
@@ -34,9 +74,11 @@ if submitted:
             st.session_state['disk_start'] = int(disk_start)
             st.session_state['disk_end'] = int(disk_end)
             st.session_state['seek_time_ms'] = float(seek_time_ms)
+            st.session_state['seek_model'] = seek_model
             st.session_state['animate'] = bool(animate)
             st.session_state['anim_speed'] = float(anim_speed)
             st.session_state['save_name'] = save_name.strip()
+            st.session_state['input_perf'] = prof.summary()
             st.success("Inputs saved. Now go to the Simulation page (Pages menu -> 02_Simulation).")
     except Exception as e:
         st.error(f"Invalid input: {e}")
@@ -1,10 +1,20 @@
 # pages/02_Simulation.py
+import os
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import time
-from algorithms import fcfs, sstf, scan, look, c_scan, c_look
-from utils import compute_disk_metrics, save_run
+from algorithms import run_algorithm
+from utils import parse_requests, save_run
+from metrics import make_seek_model
+from cache import cache_key, cached_run, requests_digest
+from export import available_formats, export_path, export_to_tempfile
+from charts import WEBGL_THRESHOLD, animated_path_figure, path_figure
+from profiling import stage
+from perf_panel import page_profiler, render_perf_panel
+from jobs import DONE
+from incremental import IncrementalSchedule
+from job_panel import submit_job, wait_for
+from concurrent.futures import wait as wait_futures
+
+SAVE_WAIT_SECONDS = 0.5  # a save usually commits well within this; slower ones are reported on a later rerun
 
 st.set_page_config(page_title="Simulation", layout="wide")
 st.title("📈 Simulation")
@@ -26,84 +36,134 @@ seek_time_ms = st.session_state['seek_time_ms']
 animate = st.session_state['animate']
 anim_speed = st.session_state['anim_speed']
 save_name = st.session_state.get('save_name', '')
+seek_model = make_seek_model(st.session_state.get('seek_model'), seek_time_ms)
+
+
+def simulate(job, digest):
+    def run():
+        result = run_algorithm(algo, requests, head, direction, disk_start, disk_end)
+        job.check()  # cancelled while scheduling: skip the metrics
+        return result
+
+    job.check()
+    return cached_run(algo, run, digest, head, direction, disk_start, disk_end, seek_model=seek_model)
+
+
+def report_saves():
+    """Outcome of this session's saves; the store reports each one to its own submitter."""
+    saves = st.session_state.get('pending_saves', [])
+    wait_futures([saved for _, saved in saves], timeout=SAVE_WAIT_SECONDS)
+    pending = []
+    for name, saved in saves:
+        if not saved.done():
+            pending.append((name, saved))
+            st.info(f"Run '{name}' is queued for saving to history.")
+        elif saved.exception() is not None:
+            st.error(f"Run '{name}' was not saved: {saved.exception()}")
+        else:
+            st.success(f"Run '{name}' saved to history.")
+    st.session_state['pending_saves'] = pending
 
-def run_algorithm_by_name(name):
-    name = name.upper()
-    if name == "FCFS":
-        return fcfs(requests, head)
-    if name == "SSTF":
-        return sstf(requests, head)
-    if name == "SCAN":
-        return scan(requests, head, direction=direction, disk_start=disk_start, disk_end=disk_end)
-    if name == "LOOK":
-        return look(requests, head, direction=direction)
-    if name == "C-SCAN":
-        return c_scan(requests, head, disk_start=disk_start, disk_end=disk_end)
-    if name == "C-LOOK":
-        return c_look(requests, head)
-    raise ValueError("Unknown algorithm")
 
 if algo == "COMPARE ALL":
     st.info("You selected 'COMPARE ALL'. Please go to the Comparison page (Pages -> 03_Comparison) to view comparisons.")
 else:
-    try:
-        res = run_algorithm_by_name(algo)
-        metrics = compute_disk_metrics(res["path"], len(requests), seek_time_per_cylinder_ms=seek_time_ms)
-        # metric cards
-        c1, c2, c3 = st.columns(3)
-        c1.metric("Total Head Movement (cyl)", metrics['total_head_movement'])
-        c2.metric("Avg Seek Distance (cyl)", metrics['average_seek_distance'])
-        c3.metric("Throughput (req/sec)", metrics['throughput_req_per_sec'])
-
-        st.markdown("---")
-        st.subheader("Servicing Order")
-        st.table(pd.DataFrame({"Step": list(range(1,len(res["order"])+1)), "Cylinder": res["order"]}))
-
-        st.markdown("---")
-        st.subheader("Disk Head Movement")
-
-        plot_placeholder = st.empty()
-
-        # narration placeholder
-        narration = st.empty()
-
-        path = res["path"]
-        # animate or static
-        if animate:
-            path_so_far = []
-            for i in range(len(path)):
-                path_so_far.append({"Step": i, "Cylinder": path[i]})
-                df_now = pd.DataFrame(path_so_far)
-                fig = px.line(df_now, x="Step", y="Cylinder", markers=True, title=f"{algo} - Animated", template="plotly_dark")
-                fig.update_traces(line_color="#38bdf8", marker=dict(size=10, color="#22d3ee"))
-                fig.update_yaxes(range=[min(path)-5, max(path)+5])
-                plot_placeholder.plotly_chart(fig, use_container_width=True)
-                # narration:
-                if i > 0:
-                    from_pos = path[i-1]; to_pos = path[i]
-                    dist = abs(to_pos - from_pos)
-                    narration.markdown(f"➡️ Step {i}: Move head from **{from_pos}** to **{to_pos}** (distance = {dist})")
+    prof = page_profiler("simulation")
+    with prof:
+        try:
+            digest = requests_digest(requests)
+            # run in the background; a large queue shows progress here instead of blocking the session
+            job = submit_job("simulation", simulate, digest,
+                             key=cache_key(digest, algo, head, direction, disk_start, disk_end, seek_model))
+            if wait_for(job) and job.status == DONE:
+                res, metrics = job.result
+                # metric cards
+                c1, c2, c3 = st.columns(3)
+                c1.metric("Total Head Movement (cyl)", metrics['total_head_movement'],
+                          help=f"Optimal: {metrics['optimal_head_movement']} (efficiency {metrics['efficiency']})")
+                c2.metric("Avg Seek Distance (cyl)", metrics['average_seek_distance'])
+                c3.metric("Throughput (req/sec)", metrics['throughput_req_per_sec'])
+                c4, c5, c6 = st.columns(3)
+                c4.metric("Wait p50 / p95 (ms)", f"{metrics['wait_p50_ms']} / {metrics['wait_p95_ms']}")
+                c5.metric("Wait p99 (ms)", metrics['wait_p99_ms'])
+                c6.metric("Starvation (max / mean wait)", metrics['starvation_ratio'])
+
+                st.markdown("---")
+                st.subheader("Servicing Order")
+                order_df = res.order_frame()
+                if len(order_df) <= 200:
+                    st.table(order_df)
                 else:
-                    narration.markdown(f"Start at head position: **{path[0]}**")
-                time.sleep(anim_speed)
-        else:
-            df_full = pd.DataFrame({"Step": list(range(len(path))), "Cylinder": path})
-            fig = px.line(df_full, x="Step", y="Cylinder", markers=True, title=f"{algo} - Head Movement", template="plotly_dark")
-            fig.update_traces(line_color="#38bdf8", marker=dict(size=10, color="#22d3ee"))
-            fig.update_yaxes(range=[min(path)-5, max(path)+5])
-            st.plotly_chart(fig, use_container_width=True)
-
-        st.success("✅ Simulation complete")
-        # Save to DB option
-        if st.button("💾 Save Run to History"):
-            name = save_name if save_name else f"{algo}_run"
-            save_run(name, st.session_state['requests_text'], head, algo, direction, disk_start, disk_end, seek_time_ms, metrics)
-            st.success("Saved run to history.")
-
-        # allow download of path CSV
-        path_df = pd.DataFrame({"Step": list(range(len(path))), "Cylinder": path})
-        csv_data = path_df.to_csv(index=False)
-        st.download_button("⬇️ Download Path CSV", csv_data, file_name="run_path.csv")
-
-    except Exception as e:
-        st.error(f"Error running algorithm: {e}")
+                    st.dataframe(order_df, use_container_width=True)  # virtualized grid for long queues
+
+                st.markdown("---")
+                st.subheader("Disk Head Movement")
+
+                path = res["path"]
+                # animate or static
+                if animate:
+                    # one figure with client-side frames; the slider label narrates each step
+                    fig = animated_path_figure(path, f"{algo} - Animated", seconds_per_frame=anim_speed)
+                    with stage("plotly_chart"):
+                        st.plotly_chart(fig, use_container_width=True)
+                else:
+                    window = None
+                    if len(path) > WEBGL_THRESHOLD:
+                        # long paths are downsampled; zooming re-renders the window at full resolution
+                        window = st.slider("Zoom to steps (full resolution inside the window):", 0, len(path), (0, len(path)))
+                    fig = path_figure(path, f"{algo} - Head Movement", window=window)
+                    with stage("plotly_chart"):
+                        st.plotly_chart(fig, use_container_width=True)
+
+                st.success("✅ Simulation complete")
+                # Save to DB option
+                if st.button("💾 Save Run to History"):
+                    name = save_name if save_name else f"{algo}_run"
+                    try:
+                        saved = save_run(name, st.session_state['requests_text'], head, algo, direction, disk_start, disk_end, seek_time_ms, metrics)
+                        st.session_state.setdefault('pending_saves', []).append((name, saved))
+                    except RuntimeError as e:  # busy queue or closed store
+                        st.error(f"Could not save run: {e}")
+                report_saves()
+
+                # allow download of the path; written to a temp file in chunks
+                e1, e2 = st.columns(2)
+                path_fmt = e1.selectbox("Path export format:", available_formats())
+                if len(path) <= 100_000 or e2.button("Prepare path export"):
+                    tmp_path = export_to_tempfile(export_path, path, fmt=path_fmt)
+                    with open(tmp_path, "rb") as f:
+                        st.download_button(f"⬇️ Download Path {path_fmt.upper()}", f, file_name=f"run_path.{path_fmt}")
+                    os.remove(tmp_path)
+
+                # what-if edits: the incremental schedule is kept in session and patched, not re-run.
+                # Expander bodies run even when collapsed, so it is only built once edits are applied.
+                with st.expander("✏️ What-if: add or remove requests"):
+                    inc_key = (digest, algo, head, direction, disk_start, disk_end)
+                    if st.session_state.get('whatif_key') != inc_key:
+                        st.session_state.pop('whatif', None)
+                    w1, w2 = st.columns(2)
+                    add_text = w1.text_input("Add cylinders:", key="whatif_add")
+                    remove_text = w2.text_input("Remove cylinders:", key="whatif_remove")
+                    if st.button("Apply edits"):
+                        try:
+                            added, removed = parse_requests(add_text), parse_requests(remove_text)
+                            inc = st.session_state.get('whatif')
+                            if inc is None:
+                                inc = IncrementalSchedule(algo, requests, head, direction, disk_start, disk_end)
+                            inc.apply(added, removed)  # all or nothing
+                            st.session_state['whatif_key'], st.session_state['whatif'] = inc_key, inc
+                        except ValueError as e:
+                            st.error(str(e))
+                    inc = st.session_state.get('whatif')
+                    if inc is not None:
+                        st.metric("Total Head Movement after edits (cyl)", inc.total_head_movement,
+                                  delta=inc.total_head_movement - res.total_head_movement, delta_color="inverse")
+                        st.caption(f"{len(inc)} requests in the edited queue.")
+                        if st.button("Use edited queue"):
+                            st.session_state['requests'] = inc.arrival_order().tolist()
+                            st.session_state['requests_text'] = ", ".join(map(str, st.session_state['requests']))
+                            st.rerun()
+
+        except Exception as e:
+            st.error(f"Error running algorithm: {e}")
+    render_perf_panel(prof, st.session_state.get('input_perf', ()), algorithm=algo, requests=len(requests))
@@ -1,9 +1,20 @@
 # pages/03_Comparison.py
+import math
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from algorithms import fcfs, sstf, scan, look, c_scan, c_look
-from utils import compute_disk_metrics
+from algorithms import ALGORITHM_NAMES
+from metrics import make_seek_model
+from cache import RESULT_CACHE, cached_compare, requests_digest
+from compare import compare_all, comparison_table
+from charts import path_figure
+from montecarlo import run_monte_carlo
+from raid import LEVELS, simulate_array
+from workloads import WORKLOADS
+from profiling import stage
+from perf_panel import page_profiler, render_perf_panel
+from jobs import DONE
+from job_panel import latest_job, submit_job, wait_for
 
 st.set_page_config(page_title="Comparison", layout="wide")
 st.title("⚔️ Compare All Algorithms")
@@ -19,40 +30,127 @@ direction = st.session_state['direction']
 disk_start = st.session_state['disk_start']
 disk_end = st.session_state['disk_end']
 seek_time_ms = st.session_state['seek_time_ms']
+seek_model = make_seek_model(st.session_state.get('seek_model'), seek_time_ms)
 
-algos = ["FCFS", "SSTF", "SCAN", "LOOK", "C-SCAN", "C-LOOK"]
-results = []
-for a in algos:
-    if a == "FCFS":
-        res = fcfs(requests, head)
-    elif a == "SSTF":
-        res = sstf(requests, head)
-    elif a == "SCAN":
-        res = scan(requests, head, direction=direction, disk_start=disk_start, disk_end=disk_end)
-    elif a == "LOOK":
-        res = look(requests, head, direction=direction)
-    elif a == "C-SCAN":
-        res = c_scan(requests, head, disk_start=disk_start, disk_end=disk_end)
-    elif a == "C-LOOK":
-        res = c_look(requests, head)
-    metrics = compute_disk_metrics(res['path'], len(requests), seek_time_per_cylinder_ms=seek_time_ms)
-    results.append((a, res, metrics))
-
-# build DataFrame
-comp_df = pd.DataFrame([{"Algorithm": a, "TotalMovement": m["total_head_movement"], "AvgSeek": m["average_seek_distance"], "Throughput": m["throughput_req_per_sec"]} for a, r, m in results])
-st.dataframe(comp_df.sort_values("TotalMovement"))
-
-col1, col2 = st.columns(2)
-col1.plotly_chart(px.bar(comp_df, x="Algorithm", y="TotalMovement", title="Total Head Movement Comparison", template="plotly_dark"), use_container_width=True)
-col2.plotly_chart(px.bar(comp_df, x="Algorithm", y="Throughput", title="Throughput Comparison", template="plotly_dark"), use_container_width=True)
+MC_CHUNK = 50
+TABLE_COLUMNS = {"algorithm": "Algorithm", "total_head_movement": "TotalMovement", "average_seek_distance": "AvgSeek",
+                 "throughput_req_per_sec": "Throughput", "efficiency": "Efficiency", "wait_p95_ms": "P95Wait",
+                 "starvation_ratio": "Starvation"}
 
+
+def compare(job, digest):
+    job.report(0, f"Running {len(ALGORITHM_NAMES)} algorithms over one shared sort")
+    return cached_compare(ALGORITHM_NAMES, lambda missing: compare_all(requests, head, direction, disk_start, disk_end,
+                                                                       seek_model, missing, check=job.check),
+                          digest, head, direction, disk_start, disk_end, seek_model=seek_model)
+
+
+def monte_carlo(job, workloads, samples, n_requests, seed):
+    rows, done = [], 0
+    total = len(workloads) * math.ceil(samples / MC_CHUNK)
+    for w in workloads:
+        latest = []
+        for latest in run_monte_carlo(w, ALGORITHM_NAMES, samples=samples, n_requests=n_requests, seed=seed,
+                                      direction=direction, disk_start=disk_start, disk_end=disk_end,
+                                      seek_model_spec=seek_model.spec(), chunk_size=MC_CHUNK):
+            done += 1
+            job.report(done / total, f"Monte Carlo: {w} ({done}/{total} chunks)", partial=rows + latest)
+        rows += latest
+    return rows
+
+
+def simulate_arrays(job, level, disks, chunk):
+    raid_rows, disk_rows = [], []
+    for i, a in enumerate(ALGORITHM_NAMES):
+        job.report(i / len(ALGORITHM_NAMES), f"Scheduling every disk for {a}")
+        array_metrics, per_disk = simulate_array([r - disk_start for r in requests], disks, a, level, chunk, head,
+                                                 direction, disk_start, disk_end, seek_model.spec())
+        raid_rows.append(array_metrics)
+        disk_rows += [{"algorithm": a, **d} for d in per_disk]
+    return raid_rows, disk_rows
+
+
+prof = page_profiler("comparison")
+with prof:
+    digest = requests_digest(requests)
+    # heavy runs go to a background job; the page polls it instead of blocking the session
+    job = submit_job("compare", compare, digest,
+                     key=(digest, head, direction, disk_start, disk_end, seek_model.spec()))
+    runs = job.result if wait_for(job) and job.status == DONE else None
+    results = [(a, r, m) for a, (r, m) in runs.items()] if runs is not None else None
+
+    if results is not None:
+        # build DataFrame
+        with stage("dataframe"):
+            comp_df = pd.DataFrame(comparison_table(runs))[list(TABLE_COLUMNS)].rename(columns=TABLE_COLUMNS)
+        st.dataframe(comp_df.sort_values("TotalMovement"))
+        st.caption(f"Optimal head movement for this request set: {results[0][2]['optimal_head_movement']} cylinders "
+                   "(Efficiency = optimal / total movement).")
+
+        col1, col2 = st.columns(2)
+        col1.plotly_chart(px.bar(comp_df, x="Algorithm", y="TotalMovement", title="Total Head Movement Comparison", template="plotly_dark"), use_container_width=True)
+        col2.plotly_chart(px.bar(comp_df, x="Algorithm", y="Throughput", title="Throughput Comparison", template="plotly_dark"), use_container_width=True)
+
+        st.markdown("---")
+        st.subheader("Individual head movement graphs")
+        cols = st.columns(2)
+        for idx, (a, r, m) in enumerate(results):
+            fig = path_figure(r['path'], f"{a} - Path", markers=False)
+            with stage("plotly_chart"):
+                cols[idx % 2].plotly_chart(fig, use_container_width=True)
+
+stats = RESULT_CACHE.stats()
+st.caption(f"Result cache: {stats['hits']} hits / {stats['misses']} misses, {stats['entries']} entries")
+
+if results is not None:
+    # Download comparison table
+    csv_buf = comp_df.to_csv(index=False)
+    st.download_button("⬇️ Download Comparison CSV", csv_buf, file_name="comparison.csv")
+
+# --- Monte Carlo over synthetic workloads ---
 st.markdown("---")
-st.subheader("Individual head movement graphs")
-cols = st.columns(2)
-for idx, (a, r, m) in enumerate(results):
-    df = pd.DataFrame({"Step": list(range(len(r['path']))), "Cylinder": r['path']})
-    cols[idx % 2].plotly_chart(px.line(df, x="Step", y="Cylinder", title=f"{a} - Path", template="plotly_dark"), use_container_width=True)
-
-# Download comparison table
-csv_buf = comp_df.to_csv(index=False)
-st.download_button("⬇️ Download Comparison CSV", csv_buf, file_name="comparison.csv")
+st.subheader("🎲 Monte Carlo evaluation")
+with st.form("monte_carlo"):
+    m1, m2, m3, m4 = st.columns(4)
+    mc_workloads = m1.multiselect("Workloads:", list(WORKLOADS), default=["uniform", "zipf"])
+    mc_samples = m2.number_input("Samples per workload:", min_value=10, value=1000, step=100)
+    mc_requests = m3.number_input("Requests per sample:", min_value=1, value=max(len(requests), 10), step=10)
+    mc_seed = m4.number_input("Seed:", min_value=0, value=0, step=1)
+    mc_run = st.form_submit_button("Run Monte Carlo")
+
+if mc_run and mc_workloads:
+    submit_job("monte_carlo", monte_carlo, list(mc_workloads), int(mc_samples), int(mc_requests), int(mc_seed))
+mc_job = latest_job("monte_carlo")
+if mc_job is not None and wait_for(mc_job, on_partial=lambda rows: st.dataframe(pd.DataFrame(rows))) \
+        and mc_job.status == DONE:
+    mc_df = pd.DataFrame(mc_job.result)
+    mc_df["ci95_movement"] = mc_df["ci95_movement_high"] - mc_df["mean_movement"]
+    st.plotly_chart(px.bar(mc_df, x="algorithm", y="mean_movement", color="workload", barmode="group",
+                           error_y="ci95_movement", title="Mean total head movement (95% CI)", template="plotly_dark"),
+                    use_container_width=True)
+    st.download_button("⬇️ Download Monte Carlo CSV", mc_df.to_csv(index=False), file_name="monte_carlo.csv")
+
+# --- RAID array: requests treated as logical cylinders striped over the disks ---
+st.markdown("---")
+st.subheader("🗄️ Array simulation")
+with st.form("raid"):
+    r1, r2, r3 = st.columns(3)
+    raid_level = r1.selectbox("RAID level:", LEVELS)
+    raid_disks = r2.number_input("Disks:", min_value=2, value=4, step=2)
+    raid_chunk = r3.number_input("Chunk size (cylinders):", min_value=1, value=8, step=1)
+    raid_run = st.form_submit_button("Simulate array")
+
+if raid_run:
+    submit_job("raid", simulate_arrays, raid_level, int(raid_disks), int(raid_chunk))
+raid_job = latest_job("raid")
+if raid_job is not None and wait_for(raid_job) and raid_job.status == DONE:
+    raid_rows, disk_rows = raid_job.result
+    raid_df = pd.DataFrame(raid_rows)
+    st.dataframe(raid_df, use_container_width=True)
+    c1, c2 = st.columns(2)
+    c1.plotly_chart(px.bar(raid_df, x="algorithm", y="throughput_req_per_sec", title="Array throughput",
+                           template="plotly_dark"), use_container_width=True)
+    c2.plotly_chart(px.bar(pd.DataFrame(disk_rows), x="algorithm", y="utilization", color="disk", barmode="group",
+                           title="Per-disk utilization", template="plotly_dark"), use_container_width=True)
+
+render_perf_panel(prof, algorithm="COMPARE ALL", requests=len(requests))
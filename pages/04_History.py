@@ -1,16 +1,93 @@
 # pages/04_History.py
+import os
 import streamlit as st
 import pandas as pd
-from utils import fetch_history, history_to_csv
+import plotly.express as px
+from algorithms import ALGORITHM_NAMES
+from utils import (HISTORY_BUCKETS, HISTORY_COLUMNS, count_history, history_aggregates, latest_run_id,
+                   query_history, throughput_over_time)
+from export import available_formats, export_history, export_to_tempfile
 
 st.set_page_config(page_title="History", layout="wide")
 st.title("📁 Saved Runs History")
 
-rows = fetch_history()
-if not rows:
+
+# Count and aggregates scan every matching row, so they are cached per filter set instead of
+# re-run on each page click. The newest run id is part of the key: a new save invalidates them.
+@st.cache_data(ttl=600, max_entries=64, show_spinner=False)
+def cached_count(version: int, **filters) -> int:
+    return count_history(**filters)
+
+
+@st.cache_data(ttl=600, max_entries=64, show_spinner="Summarising runs…")
+def cached_aggregates(version: int, **filters):
+    return history_aggregates(**filters)
+
+
+@st.cache_data(ttl=600, max_entries=64, show_spinner="Summarising runs…")
+def cached_trend(version: int, bucket: str, **filters):
+    return throughput_over_time(bucket, **filters)
+
+
+# --- Filters ---
+f1, f2, f3, f4, f5 = st.columns(5)
+algorithm = f1.selectbox("Algorithm:", ["All", *ALGORITHM_NAMES])
+name_prefix = f2.text_input("Name starts with:", value="")
+since = f3.date_input("From:", value=None)
+until = f4.date_input("Until (exclusive):", value=None)
+page_size = f5.selectbox("Rows per page:", [25, 50, 100, 500], index=1)
+filters = {
+    "algorithm": None if algorithm == "All" else algorithm,
+    "name_prefix": name_prefix.strip() or None,
+    "since": since.isoformat() if since else None,
+    "until": until.isoformat() if until else None,
+}
+
+# keyset pagination: a stack of before_id cursors, reset whenever the filters change
+filter_key = (tuple(filters.items()), page_size)
+if st.session_state.get('history_filter_key') != filter_key:
+    st.session_state['history_filter_key'] = filter_key
+    st.session_state['history_cursors'] = [None]
+cursors = st.session_state['history_cursors']
+
+version = latest_run_id()
+total = cached_count(version, **filters)
+if total == 0:
     st.info("No saved runs yet. Save runs from Simulation page.")
-else:
-    df = pd.DataFrame(rows, columns=["id","name","requests","head","algorithm","direction","disk_start","disk_end","seek_ms","total_movement","avg_seek","throughput","timestamp"])
-    st.dataframe(df)
-    csv = history_to_csv(rows)
-    st.download_button("⬇️ Download Full History CSV", csv, file_name="history.csv")
+    st.stop()
+
+rows = query_history(limit=page_size, before_id=cursors[-1], **filters)
+st.caption(f"{total} matching runs — page {len(cursors)}")
+st.dataframe(pd.DataFrame(rows, columns=HISTORY_COLUMNS))
+
+p1, p2 = st.columns(2)
+if p1.button("‹ Newer", disabled=len(cursors) == 1):
+    cursors.pop()
+    st.rerun()
+if p2.button("Older ›", disabled=len(rows) < page_size):
+    cursors.append(rows[-1][0])
+    st.rerun()
+
+# --- Aggregates (computed in SQLite) ---
+st.markdown("---")
+st.subheader("Per-algorithm summary")
+agg = pd.DataFrame(cached_aggregates(version, **filters),
+                   columns=["algorithm", "runs", "mean_movement", "min_movement", "max_movement", "mean_throughput", "max_throughput", "mean_efficiency"])
+st.dataframe(agg)
+
+bucket = st.selectbox("Throughput over time, per:", list(HISTORY_BUCKETS), index=1)
+trend = pd.DataFrame(cached_trend(version, bucket, **filters),
+                     columns=["bucket", "algorithm", "runs", "mean_throughput", "mean_movement"])
+if not trend.empty:
+    st.plotly_chart(px.line(trend, x="bucket", y="mean_throughput", color="algorithm", markers=True,
+                            title="Mean throughput over time", template="plotly_dark"), use_container_width=True)
+
+# --- Export (streamed from SQLite in chunks) ---
+st.markdown("---")
+e1, e2 = st.columns(2)
+export_fmt = e1.selectbox("Export format:", available_formats())
+if e2.button("Prepare export of matching runs"):
+    tmp_path = export_to_tempfile(export_history, fmt=export_fmt, **filters)
+    with open(tmp_path, "rb") as f:
+        st.download_button(f"⬇️ Download History {export_fmt.upper()}", f, file_name=f"history.{export_fmt}")
+    os.remove(tmp_path)
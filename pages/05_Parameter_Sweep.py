@@ -0,0 +1,55 @@
+# pages/05_Parameter_Sweep.py
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from sweep import SWEEP_ALGORITHMS, sweep, sweep_frame
+from profiling import stage
+from perf_panel import page_profiler, render_perf_panel
+
+MAX_COLUMNS = 1000  # heatmap columns; the sweep itself always covers every cylinder
+
+st.set_page_config(page_title="Parameter Sweep", layout="wide")
+st.title("🗺️ Parameter Sweep")
+
+if 'requests' not in st.session_state:
+    st.error("No input found. Go to Input page and submit requests.")
+    st.stop()
+
+requests = st.session_state['requests']
+head = st.session_state['head']
+disk_start = st.session_state['disk_start']
+disk_end = st.session_state['disk_end']
+
+st.caption("Total head movement for every initial head position and direction, over the current request set "
+           "(SSTF has no closed form and is not swept).")
+algos = st.multiselect("Algorithms:", list(SWEEP_ALGORITHMS), default=list(SWEEP_ALGORITHMS))
+
+prof = page_profiler("sweep")
+with prof:
+    result = sweep(requests, disk_start=disk_start, disk_end=disk_end, algorithms=algos)
+    if not result.totals:
+        st.info("Select at least one algorithm.")
+    else:
+        stride = max(1, -(-len(result.heads) // MAX_COLUMNS))
+        heads = result.heads[::stride]
+        with stage("render"):
+            fig = px.imshow([t[::stride] for t in result.totals.values()], x=heads, y=list(result.totals),
+                            aspect="auto", color_continuous_scale="Viridis",
+                            labels={"x": "Initial head", "y": "Schedule", "color": "Total movement"},
+                            title="Total head movement by initial head position")
+            fig.add_vline(x=head, line_dash="dash", line_color="white")
+        st.plotly_chart(fig, use_container_width=True)
+        if stride > 1:
+            st.caption(f"Showing every {stride}th cylinder; best positions below use the full sweep.")
+
+        fig_line = px.line(sweep_frame(result, stride), x="head", y="total", color="schedule",
+                           title="Total head movement vs initial head")
+        st.plotly_chart(fig_line, use_container_width=True)
+
+        idx = min(max(head - int(result.heads[0]), 0), len(result.heads) - 1)
+        best = result.best_heads()
+        st.subheader("Best initial head per schedule")
+        st.dataframe(pd.DataFrame([{"Schedule": label, "BestHead": best[label], "BestTotal": int(t.min()),
+                                    "CurrentHead": head, "CurrentTotal": int(t[idx]), "WorstTotal": int(t.max())}
+                                   for label, t in result.totals.items()]), use_container_width=True)
+render_perf_panel(prof, requests=len(requests), disk_cylinders=disk_end - disk_start + 1)
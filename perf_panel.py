@@ -0,0 +1,34 @@
+# perf_panel.py
+import json
+import pandas as pd
+import streamlit as st
+from profiling import Profiler
+
+CPROFILE_KEY = "perf_cprofile"
+TRACEMALLOC_KEY = "perf_tracemalloc"
+
+
+def page_profiler(name: str) -> Profiler:
+    """Profiler for this rerun, using the capture options chosen in the panel."""
+    return Profiler(name, profile=st.session_state.get(CPROFILE_KEY, False),
+                    trace_memory=st.session_state.get(TRACEMALLOC_KEY, False))
+
+
+def render_perf_panel(prof: Profiler, extra_records=(), **context):
+    with st.expander("⏱️ Performance"):
+        c1, c2 = st.columns(2)
+        c1.checkbox("Capture cProfile on next run", key=CPROFILE_KEY)
+        c2.checkbox("Trace memory (tracemalloc) on next run", key=TRACEMALLOC_KEY)
+        records = [*extra_records, *prof.summary()]
+        if not records:
+            st.caption("No stages recorded.")
+            return
+        df = pd.DataFrame(records)
+        df["stage"] = ["  " * d + s for d, s in zip(df["depth"], df["stage"])]
+        st.dataframe(df.drop(columns=["depth", "ns"]), use_container_width=True)
+        st.caption(f"Total script time: {prof.total_ns / 1e6:.3f} ms")
+        stats = prof.profile_stats()
+        if stats:
+            st.code(stats)
+        lines = [json.dumps({"run": "input", **r}) for r in extra_records] + prof.log_records(**context)
+        st.download_button("⬇️ Download perf log (JSON lines)", "\n".join(lines) + "\n", file_name="perf_log.jsonl")
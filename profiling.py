@@ -0,0 +1,130 @@
+# profiling.py
+"""
+Lightweight per-stage instrumentation.
+Code marks stages with `with stage("schedule"):` or `@timed("render")`; these are
+no-ops unless a Profiler is active in the current context. An active Profiler
+records nanosecond wall time per stage, optionally traced peak memory per stage
+(tracemalloc) and a cProfile of the whole run, and exports everything as
+structured JSON log records.
+cProfile, tracemalloc, pstats and logging are imported only when used, so importing
+this module (and the core modules that mark stages) stays cheap.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Dict, List, Optional
+
+LOGGER_NAME = "disksched.perf"
+_active: ContextVar[Optional["Profiler"]] = ContextVar("disksched_profiler", default=None)
+
+
+class Profiler:
+    def __init__(self, name: str = "run", profile: bool = False, trace_memory: bool = False):
+        self.name = name
+        self.records: List[Dict] = []
+        self._profile = None
+        self._tracemalloc = None
+        if profile:
+            import cProfile
+            self._profile = cProfile.Profile()
+        if trace_memory:
+            import tracemalloc
+            self._tracemalloc = tracemalloc
+        self._started_tracing = False
+        self._depth = 0
+        self._token = None
+        self._start_ns = 0
+        self.total_ns = 0
+
+    def __enter__(self):
+        self._token = _active.set(self)
+        if self._tracemalloc is not None and not self._tracemalloc.is_tracing():
+            self._tracemalloc.start()
+            self._started_tracing = True
+        if self._profile is not None:
+            self._profile.enable()
+        self._start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.total_ns = time.perf_counter_ns() - self._start_ns
+        if self._profile is not None:
+            self._profile.disable()
+        if self._started_tracing:
+            self._tracemalloc.stop()
+            self._started_tracing = False
+        _active.reset(self._token)
+        return False
+
+    @contextmanager
+    def stage(self, name: str):
+        record = {"stage": name, "depth": self._depth}
+        self.records.append(record)  # appended on entry, so records stay in start order
+        tm = self._tracemalloc
+        if tm is not None and tm.is_tracing():
+            tm.reset_peak()
+        self._depth += 1
+        start = time.perf_counter_ns()
+        try:
+            yield record
+        finally:
+            record["ns"] = time.perf_counter_ns() - start
+            self._depth -= 1
+            if tm is not None and tm.is_tracing():
+                record["peak_bytes"] = tm.get_traced_memory()[1]
+
+    def add_records(self, records: List[Dict]) -> None:
+        """Nest records captured elsewhere (e.g. a background job's stages) under the current stage."""
+        self.records.extend({**r, "depth": r["depth"] + self._depth} for r in records)
+
+    def summary(self) -> List[Dict]:
+        """Records in start order, with milliseconds added."""
+        return [{**r, "ms": round(r["ns"] / 1e6, 3)} for r in self.records]
+
+    def profile_stats(self, limit: int = 25, sort: str = "cumulative") -> str:
+        if self._profile is None:
+            return ""
+        import io
+        import pstats
+        out = io.StringIO()
+        pstats.Stats(self._profile, stream=out).sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def log_records(self, **context) -> List[str]:
+        """One JSON line per stage, also emitted on the disksched.perf logger."""
+        import json
+        import logging
+        logger = logging.getLogger(LOGGER_NAME)
+        lines = []
+        for r in self.records:
+            line = json.dumps({"run": self.name, **context, **r}, default=str)
+            logger.info(line)
+            lines.append(line)
+        return lines
+
+
+def current_profiler() -> Optional[Profiler]:
+    return _active.get()
+
+
+@contextmanager
+def stage(name: str):
+    prof = _active.get()
+    if prof is None:
+        yield None
+        return
+    with prof.stage(name) as record:
+        yield record
+
+
+def timed(name: str):
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _active.get() is None:
+                return fn(*args, **kwargs)
+            with stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,86 @@
+# raid.py
+"""
+RAID-0 / RAID-10 array simulation.
+A logical request stream (logical cylinders) is striped across the array in chunks
+of `chunk_size`. Each spindle then runs the chosen algorithm on its own queue in a
+process pool, and the per-disk completion times are merged into array metrics.
+The array finishes when its slowest disk does.
+RAID-10 stripes over mirror pairs, and reads alternate between the two mirrors of a
+pair by stripe row. Mirrored writes are not modelled.
+"""
+import os
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from algorithms import run_algorithm
+from metrics import PERCENTILES, completion_times, make_seek_model
+
+LEVELS = ("raid0", "raid10")
+
+
+def data_disks(level: str, disks: int) -> int:
+    if level not in LEVELS:
+        raise ValueError(f"Unknown RAID level: {level}")
+    if level == "raid10" and (disks < 2 or disks % 2):
+        raise ValueError("RAID-10 needs an even number of disks")
+    return disks // 2 if level == "raid10" else disks
+
+
+def stripe(requests, disks: int, level: str = "raid0", chunk_size: int = 8,
+           disk_start: int = 0, disk_end: int = 199) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized logical -> (disk, cylinder) mapping."""
+    width = data_disks(level, disks)
+    # only whole chunks are striped; a partial chunk at the end of each disk stays unused
+    per_disk = (disk_end - disk_start + 1) // chunk_size * chunk_size
+    if per_disk == 0:
+        raise ValueError(f"Chunk size {chunk_size} is larger than the disk ({disk_end - disk_start + 1} cylinders)")
+    r = np.asarray(requests, dtype=np.int64)
+    if r.size and (r.min() < 0 or r.max() >= width * per_disk):
+        raise ValueError(f"Logical request out of range [0, {width * per_disk})")
+    stripe_no, within = np.divmod(r, chunk_size)
+    row, column = np.divmod(stripe_no, width)
+    disk = 2 * column + row % 2 if level == "raid10" else column
+    return disk, disk_start + row * chunk_size + within
+
+
+def _run_disk(disk: int, requests: np.ndarray, algorithm: str, head: int, direction: str,
+              disk_start: int, disk_end: int, seek_model_spec: Optional[Dict]) -> Dict:
+    res = run_algorithm(algorithm, requests, head, direction, disk_start, disk_end)
+    wait, total_ms = completion_times(res.path, make_seek_model(seek_model_spec), res.serviced_indices())
+    return {"disk": disk, "requests": int(requests.size), "total_head_movement": res.total_head_movement,
+            "busy_ms": total_ms, "wait_ms": wait.astype(np.float32)}
+
+
+def simulate_array(requests, disks: int, algorithm: str, level: str = "raid0", chunk_size: int = 8,
+                   head: int = 0, direction: str = "right", disk_start: int = 0, disk_end: int = 199,
+                   seek_model_spec: Optional[Dict] = None, workers: Optional[int] = None) -> Tuple[Dict, List[Dict]]:
+    """Array-level metrics and per-disk rows for one algorithm. Every disk starts at `head`."""
+    disk_of, cylinder = stripe(requests, disks, level, chunk_size, disk_start, disk_end)
+    queues = [cylinder[disk_of == d] for d in range(disks)]
+    args = (algorithm, head, direction, disk_start, disk_end, seek_model_spec)
+    if workers == 1:
+        per_disk = [_run_disk(d, q, *args) for d, q in enumerate(queues)]
+    else:
+        from jobs import process_pool  # forkserver/spawn: this runs inside threaded servers and jobs
+        with process_pool(min(workers or os.cpu_count(), disks)) as pool:
+            per_disk = list(pool.map(_run_disk, range(disks), queues, *[[a] * disks for a in args]))
+
+    wait = np.concatenate([d.pop("wait_ms") for d in per_disk]).astype(np.float64)
+    makespan = max(d["busy_ms"] for d in per_disk)
+    counts = np.array([d["requests"] for d in per_disk])
+    for d in per_disk:
+        d["utilization"] = round(d["busy_ms"] / makespan, 4) if makespan > 0 else 0
+        d["busy_ms"] = round(d["busy_ms"], 3)
+    qs = np.percentile(wait, PERCENTILES) if wait.size else [0] * len(PERCENTILES)
+    metrics = {
+        "algorithm": algorithm, "level": level, "disks": disks, "chunk_size": chunk_size,
+        "requests": int(wait.size),
+        "total_head_movement": sum(d["total_head_movement"] for d in per_disk),
+        "total_time_seconds": round(makespan / 1000.0, 5),
+        "throughput_req_per_sec": round(wait.size / (makespan / 1000.0), 3) if makespan > 0 else 0,
+        "mean_wait_ms": round(float(wait.mean()), 3) if wait.size else 0,
+        **{f"wait_p{p}_ms": round(float(q), 3) for p, q in zip(PERCENTILES, qs)},
+        "max_wait_ms": round(float(wait.max()), 3) if wait.size else 0,
+        # busiest disk's queue relative to the mean queue
+        "load_imbalance": round(float(counts.max() / counts.mean()), 3) if counts.sum() else 0,
+    }
+    return metrics, per_disk
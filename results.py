@@ -0,0 +1,105 @@
+# results.py
+"""
+Compact schedule result.
+Only the head path is stored (int32, or int64 when cylinders do not fit). The servicing order is the path minus the
+starting head and any visual points (sweep boundaries, wrap-around targets), so it
+is derived on demand together with metrics and DataFrame views.
+"""
+from typing import Dict, Iterable
+import numpy as np
+from metrics import compute_metrics
+from oracle import efficiency, static_optimum
+from profiling import timed
+
+KEYS = ("name", "order", "path", "total_head_movement")
+_INT32 = np.iinfo(np.int32)
+
+
+def _compact_path(path) -> np.ndarray:
+    """int32 copy of the path, unless a cylinder would wrap around; then int64."""
+    arr = np.asarray(path)
+    if arr.dtype == np.int32 or not arr.size:
+        return np.ascontiguousarray(arr, dtype=np.int32)
+    arr = np.ascontiguousarray(arr, dtype=np.int64)
+    if arr.min() < _INT32.min or arr.max() > _INT32.max:
+        return arr
+    return arr.astype(np.int32)
+
+
+class ScheduleResult:
+    __slots__ = ("name", "total_head_movement", "_path", "_visual")
+
+    def __init__(self, name: str, path, total_head_movement: int, visual: Iterable[int] = ()):
+        self.name = name
+        self.total_head_movement = int(total_head_movement)
+        self._path = _compact_path(path)
+        self._visual = np.asarray(visual, dtype=np.int64)
+
+    @property
+    def path(self) -> np.ndarray:
+        return self._path
+
+    @property
+    def order(self) -> np.ndarray:
+        if not self._visual.size:
+            return self._path[1:]
+        return np.delete(self._path, np.concatenate([[0], self._visual]))
+
+    @property
+    def nbytes(self) -> int:
+        return self._path.nbytes + self._visual.nbytes
+
+    @property
+    def requests_count(self) -> int:
+        return max(len(self._path) - 1 - self._visual.size, 0)
+
+    @property
+    def efficiency(self) -> float:
+        """Optimal / actual movement, counting every cylinder travelled (wrap jumps included)."""
+        moved = int(np.abs(np.diff(self._path.astype(np.int64))).sum())
+        return efficiency(moved, static_optimum(self.order, int(self._path[0])) if len(self._path) else 0)
+
+    # --- dict-style access, so res["path"] keeps working ---
+    def __getitem__(self, key: str):
+        if key not in KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key) -> bool:
+        return key in KEYS
+
+    def get(self, key: str, default=None):
+        return self[key] if key in KEYS else default
+
+    def keys(self):
+        return KEYS
+
+    def to_dict(self) -> Dict:
+        return {"name": self.name, "order": self.order.tolist(), "path": self._path.tolist(),
+                "total_head_movement": self.total_head_movement, "efficiency": self.efficiency}
+
+    # --- derived views ---
+    def serviced_indices(self) -> np.ndarray:
+        idx = np.arange(1, len(self._path))
+        return np.delete(idx, self._visual - 1) if self._visual.size else idx
+
+    def metrics(self, seek_time_per_cylinder_ms: float = 1.0, seek_model=None,
+                rotational_latency_ms: float = 0.0) -> Dict:
+        return compute_metrics(self._path, self.requests_count, seek_model=seek_model,
+                               seek_time_per_cylinder_ms=seek_time_per_cylinder_ms,
+                               serviced=self.serviced_indices(), rotational_latency_ms=rotational_latency_ms)
+
+    @timed("dataframe")
+    def to_frame(self):
+        import pandas as pd
+        return pd.DataFrame({"Step": np.arange(len(self._path)), "Cylinder": self._path})
+
+    @timed("dataframe")
+    def order_frame(self):
+        import pandas as pd
+        order = self.order
+        return pd.DataFrame({"Step": np.arange(1, len(order) + 1), "Cylinder": order})
+
+    def __repr__(self) -> str:
+        return (f"ScheduleResult(name={self.name!r}, requests={self.requests_count}, "
+                f"total_head_movement={self.total_head_movement})")
@@ -0,0 +1,202 @@
+# run_store.py
+"""
+Write-behind run store.
+All inserts go through one writer thread that drains a bounded queue and commits
+each batch in a single transaction. The database runs in WAL mode, so pooled read
+connections never wait on the writer and concurrent sessions don't hit
+"database is locked".
+submit() never blocks: it returns a Future for that submission, which resolves to
+the number of rows written or fails with RunStoreError if its batch did not commit.
+Failures are also logged. A full queue raises RunStoreBusy at once.
+"""
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Sequence
+
+SCHEMA_STATEMENTS = (
+    '''
+    CREATE TABLE IF NOT EXISTS runs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT,
+        requests TEXT,
+        head INTEGER,
+        algorithm TEXT,
+        direction TEXT,
+        disk_start INTEGER,
+        disk_end INTEGER,
+        seek_ms REAL,
+        total_movement INTEGER,
+        avg_seek REAL,
+        throughput REAL,
+        efficiency REAL,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_runs_algorithm ON runs (algorithm, id)',
+    'CREATE INDEX IF NOT EXISTS idx_runs_timestamp ON runs (timestamp)',
+    'CREATE INDEX IF NOT EXISTS idx_runs_name ON runs (name)',
+)
+INSERT_COLUMNS = ("name", "requests", "head", "algorithm", "direction", "disk_start", "disk_end",
+                  "seek_ms", "total_movement", "avg_seek", "throughput", "efficiency")
+# columns added after the first release: (name, type), added to older databases on open
+MIGRATIONS = (("efficiency", "REAL"),)
+INSERT_SQL = f"INSERT INTO runs ({', '.join(INSERT_COLUMNS)}) VALUES ({', '.join('?' * len(INSERT_COLUMNS))})"
+
+_STOP = object()
+logger = logging.getLogger("disksched.run_store")
+
+
+class RunStoreError(RuntimeError):
+    """The batch holding these rows failed to commit; they were not saved."""
+
+
+class RunStoreBusy(RuntimeError):
+    """The write queue is full; the caller should retry later."""
+
+
+def _connect(db_file: str, check_same_thread: bool = True) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_file, timeout=30, check_same_thread=check_same_thread)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')  # WAL + NORMAL: durable at checkpoint, no fsync per commit
+    return conn
+
+
+class RunStore:
+    def __init__(self, db_file: str, max_queue: int = 10_000, batch_size: int = 500, readers: int = 4):
+        self.db_file = db_file
+        self.batch_size = batch_size
+        self.written = 0
+        self.failed = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._readers = queue.LifoQueue(maxsize=readers)
+        conn = _connect(db_file)
+        for stmt in SCHEMA_STATEMENTS:
+            conn.execute(stmt)
+        existing = {row[1] for row in conn.execute('PRAGMA table_info(runs)')}
+        for column, sql_type in MIGRATIONS:
+            if column not in existing:
+                conn.execute(f'ALTER TABLE runs ADD COLUMN {column} {sql_type}')
+        conn.commit()
+        conn.close()
+        self._thread = threading.Thread(target=self._writer, name="run-store-writer", daemon=True)
+        self._thread.start()
+
+    # --- writes ---
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, rows: Sequence[Sequence]) -> Future:
+        """
+        Queue rows (tuples in INSERT_COLUMNS order) for the writer. Never blocks.
+        The returned Future belongs to this submission only, so a failure is reported
+        to the caller that made it and not to whoever saves next.
+        """
+        if not self._thread.is_alive():
+            raise RuntimeError("Run store is closed")
+        rows = list(rows)
+        done = Future()
+        try:
+            self._queue.put_nowait((rows, done))
+        except queue.Full:
+            raise RunStoreBusy(f"Run store is busy ({self.pending} batches waiting); try again shortly") from None
+        return done
+
+    def _writer(self):
+        conn = _connect(self.db_file)
+        try:
+            while True:
+                item = self._queue.get()
+                items, stop = [], item is _STOP
+                if not stop:
+                    items.append(item)
+                while not stop and sum(len(rows) for rows, _ in items) < self.batch_size:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stop = True
+                    else:
+                        items.append(item)
+                batch = [row for rows, _ in items for row in rows]
+                try:
+                    if batch:
+                        with conn:  # one transaction per batch
+                            conn.executemany(INSERT_SQL, batch)
+                    self.written += len(batch)
+                    for rows, done in items:
+                        done.set_result(len(rows))
+                except sqlite3.Error as e:
+                    self.failed += len(batch)
+                    logger.error("Failed to save %d run(s) to %s: %s", len(batch), self.db_file, e)
+                    for rows, done in items:
+                        error = RunStoreError(f"{len(rows)} run(s) were not saved: {e}")
+                        error.__cause__ = e
+                        done.set_exception(error)
+                for _ in range(len(items) + stop):
+                    self._queue.task_done()
+                if stop:
+                    return
+        finally:
+            conn.close()
+
+    def flush(self) -> None:
+        """Block until everything queued so far has been written or has failed."""
+        self._queue.join()
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+
+    # --- reads ---
+    @contextmanager
+    def reader(self):
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            conn = _connect(self.db_file, check_same_thread=False)
+        try:
+            yield conn
+        finally:
+            try:
+                self._readers.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_run_store(db_file: str) -> RunStore:
+    """One store (and writer thread) per database file per process."""
+    with _stores_lock:
+        store = _stores.get(db_file)
+        if store is None:
+            store = _stores[db_file] = RunStore(db_file)
+        return store
+
+
+@atexit.register
+def _close_all():
+    for store in list(_stores.values()):
+        store.close()
+
+
+def metrics_row(name: str, requests_text: str, head: int, algorithm: str, direction: str,
+                disk_start: int, disk_end: int, seek_ms: float, metrics) -> tuple:
+    return (name, requests_text, head, algorithm, direction, disk_start, disk_end, seek_ms,
+            metrics.get("total_head_movement", 0), metrics.get("average_seek_distance", 0),
+            metrics.get("throughput_req_per_sec", 0), metrics.get("efficiency"))
@@ -0,0 +1,371 @@
+# service.py
+"""
+Local HTTP scheduling service (stdlib asyncio, no web framework).
+
+    python service.py serve --port 8765 --workers 4
+    python service.py load --concurrency 32 --total 2000 --size 1000
+
+Endpoints:
+    GET  /health
+    GET  /algorithms
+    POST /schedule   {"algorithm", "requests", "head", "direction"?, "disk_start"?, "disk_end"?,
+                      "seek_model"?, "include_path"?}
+    POST /schedule?stream=1   same body; chunked NDJSON: a summary line, then the path in slices
+    POST /metrics    {"path", "requests_count", "seek_time_per_cylinder_ms"?, "seek_model"?}
+
+Concurrent jobs are micro-batched: the batcher waits up to `max_delay_ms` (or until
+`max_batch` jobs / `max_batch_points` cylinders are queued) and then sends the whole
+batch to the process pool as one task. Many small requests share a single IPC round
+trip, and the event loop never runs scheduling code itself.
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from algorithms import ALGORITHM_NAMES, run_algorithm
+from metrics import make_seek_model
+from utils import compute_disk_metrics
+
+STREAM_CHUNK_POINTS = 65_536
+MAX_BODY_BYTES = 256 << 20
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+           500: "Internal Server Error"}
+
+
+# --- work done in the pool; top-level so it pickles ---
+def _evaluate(job: Dict):
+    if job["op"] == "metrics":
+        seek_ms = float(job.get("seek_time_per_cylinder_ms", 1.0))
+        return {"metrics": compute_disk_metrics(job["path"], int(job["requests_count"]), seek_ms,
+                                                seek_model=make_seek_model(job.get("seek_model"), seek_ms))}
+    res = run_algorithm(job["algorithm"], job["requests"], int(job.get("head", 0)), job.get("direction", "right"),
+                        int(job.get("disk_start", 0)), int(job.get("disk_end", 199)))
+    seek_model = make_seek_model(job.get("seek_model"), float(job.get("seek_time_per_cylinder_ms", 1.0)))
+    out = {"name": res.name, "total_head_movement": res.total_head_movement, "requests": res.requests_count,
+           "metrics": res.metrics(seek_model=seek_model)}
+    if job.get("include_path") or job.get("stream"):
+        out["path"] = res.path  # int32 array (int64 for huge cylinders); pickles compactly
+    return out
+
+
+def evaluate_batch(jobs: List[Dict]) -> List[Tuple[bool, object]]:
+    """(ok, result or error message) per job; one bad job doesn't fail the batch."""
+    out = []
+    for job in jobs:
+        try:
+            out.append((True, _evaluate(job)))
+        except Exception as e:
+            out.append((False, f"{type(e).__name__}: {e}"))
+    return out
+
+
+def _ignore_sigint():
+    # Ctrl-C reaches the whole process group; the server drains in-flight batches, then stops the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+class MicroBatcher:
+    def __init__(self, executor=None, max_batch: int = 64, max_batch_points: int = 1_000_000,
+                 max_delay_ms: float = 2.0):
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_batch_points = max_batch_points
+        self.max_delay = max_delay_ms / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._inflight = set()  # the loop only keeps weak references to tasks
+        self.batches = 0
+        self.jobs = 0
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 10.0):
+        """Stop batching, let in-flight batches finish (up to `timeout`) and fail everything else."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        while self._queue is not None and not self._queue.empty():
+            _, fut = self._queue.get_nowait()
+            _fail([fut], "service is shutting down")
+        if self._inflight:
+            _, pending = await asyncio.wait(set(self._inflight), timeout=timeout)
+            for task in pending:
+                task.cancel()  # _dispatch fails its futures on cancellation
+            if pending:
+                await asyncio.wait(pending)
+
+    async def submit(self, job: Dict):
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((job, fut))
+        return await fut
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            points = _points(batch[0][0])
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch and points < self.max_batch_points:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                points += _points(item[0])
+            self.batches += 1
+            self.jobs += len(batch)
+            # run batches concurrently; the pool bounds the parallelism
+            task = asyncio.create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch):
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.executor, evaluate_batch, [job for job, _ in batch])
+        except asyncio.CancelledError:
+            _fail([fut for _, fut in batch], "service is shutting down")
+            raise
+        except Exception as e:  # pool broken, pickling failure, ...
+            results = [(False, f"{type(e).__name__}: {e}")] * len(batch)
+        for (_, fut), result in zip(batch, results):
+            if not fut.done():
+                fut.set_result(result)
+
+
+def _fail(futures, message: str) -> None:
+    for fut in futures:
+        if not fut.done():
+            fut.set_result((False, message))
+
+
+def _points(job: Dict) -> int:
+    return len(job.get("requests") or job.get("path") or ())
+
+
+# --- HTTP plumbing ---
+async def _read_request(reader: asyncio.StreamReader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    method, target, version = lines[0].split(" ", 2)
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            k, v = line.split(":", 1)
+            headers[k.strip().lower()] = v.strip()
+    length = int(headers.get("content-length", 0))
+    if length > MAX_BODY_BYTES:
+        raise ValueError("body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method, target, version, headers, body
+
+
+def _response(status: int, payload, keep_alive: bool) -> bytes:
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode() + body
+
+
+async def _write_stream(writer: asyncio.StreamWriter, result: Dict, keep_alive: bool):
+    """Chunked NDJSON: summary line, then {"path": [...]} lines of STREAM_CHUNK_POINTS cylinders."""
+    writer.write((f"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\nTransfer-Encoding: chunked\r\n"
+                  f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode())
+    path = result.pop("path")
+
+    async def chunk(data: bytes):
+        writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+        await writer.drain()  # backpressure: don't buffer the whole path for a slow client
+
+    await chunk(json.dumps({**result, "path_length": int(len(path))}).encode() + b"\n")
+    for i in range(0, len(path), STREAM_CHUNK_POINTS):
+        await chunk(json.dumps({"path": path[i:i + STREAM_CHUNK_POINTS].tolist()}).encode() + b"\n")
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+
+
+class SchedulingService:
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, workers: Optional[int] = None,
+                 max_batch: int = 64, max_delay_ms: float = 2.0):
+        self.host, self.port = host, port
+        self.workers = os.cpu_count() if workers is None else workers
+        self.max_batch, self.max_delay_ms = max_batch, max_delay_ms
+        self.batcher: Optional[MicroBatcher] = None
+        self._server = None
+        self._pool = None
+
+    async def start(self):
+        if self.workers > 0:
+            from jobs import process_pool  # forked workers would also inherit open client sockets
+            self._pool = process_pool(self.workers, initializer=_ignore_sigint)
+            # start the workers now, not on the first request
+            await asyncio.gather(*(asyncio.get_running_loop().run_in_executor(self._pool, evaluate_batch, [])
+                                   for _ in range(self.workers)))
+        # workers=0: batches run on the loop's default thread pool (handy for debugging)
+        self.batcher = MicroBatcher(self._pool, self.max_batch, max_delay_ms=self.max_delay_ms)
+        self.batcher.start()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()  # stop accepting; open handlers finish once their batch is resolved
+        if self.batcher is not None:
+            await self.batcher.stop()  # before the pool goes away, so in-flight batches can finish
+        if self._server is not None:
+            await self._server.wait_closed()
+        if self._pool is not None:
+            # nothing is in flight any more; waiting lets the workers exit before the interpreter does
+            await asyncio.to_thread(self._pool.shutdown, wait=True, cancel_futures=True)
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"Serving on http://{self.host}:{self.port} with {self.workers} worker process(es)")
+        try:
+            await self._server.serve_forever()
+        finally:  # Ctrl-C / cancellation: drain the batcher and shut the pool down
+            await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    method, target, version, headers, body = await _read_request(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                except (ValueError, asyncio.LimitOverrunError):
+                    writer.write(_response(413, {"error": "request too large or malformed"}, False))
+                    await writer.drain()
+                    return
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                await self._route(writer, method, target, body, keep_alive)
+                if not keep_alive:
+                    return
+        finally:
+            writer.close()
+
+    async def _route(self, writer, method: str, target: str, body: bytes, keep_alive: bool):
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        if url.path == "/health":
+            status, payload = 200, {"status": "ok", "batches": self.batcher.batches, "jobs": self.batcher.jobs}
+        elif url.path == "/algorithms":
+            status, payload = 200, {"algorithms": ALGORITHM_NAMES}
+        elif url.path in ("/schedule", "/metrics"):
+            if method != "POST":
+                status, payload = 405, {"error": "use POST"}
+            else:
+                try:
+                    job = json.loads(body or b"{}")
+                    if not isinstance(job, dict):
+                        raise ValueError("body must be a JSON object")
+                except ValueError as e:
+                    status, payload = 400, {"error": f"invalid JSON: {e}"}
+                else:
+                    job["op"] = url.path[1:]
+                    job["stream"] = query.get("stream", ["0"])[0] in ("1", "true")
+                    ok, result = await self.batcher.submit(job)
+                    if ok and job["stream"] and job["op"] == "schedule":
+                        await _write_stream(writer, result, keep_alive)
+                        return
+                    status, payload = (200, _jsonable(result)) if ok else (400, {"error": result})
+        else:
+            status, payload = 404, {"error": f"no route {url.path}"}
+        writer.write(_response(status, payload, keep_alive))
+        await writer.drain()
+
+
+def _jsonable(result: Dict) -> Dict:
+    if "path" in result:
+        result = {**result, "path": result["path"].tolist()}
+    return result
+
+
+# --- load generator ---
+async def _client(host: str, port: int, bodies: List[bytes], latencies: List[float], errors: List[str]):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for body in bodies:
+            start = time.perf_counter()
+            writer.write((f"POST /schedule HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                          f"Content-Length: {len(body)}\r\n\r\n").encode() + body)
+            await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = next(int(line.split(b":", 1)[1]) for line in head.split(b"\r\n")
+                          if line.lower().startswith(b"content-length"))
+            payload = await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if not head.startswith(b"HTTP/1.1 200"):
+                errors.append(payload.decode(errors="replace"))
+    finally:
+        writer.close()
+
+
+async def load_test(host: str = "127.0.0.1", port: int = 8765, concurrency: int = 16, total: int = 1000,
+                    size: int = 1000, algorithm: str = "SSTF", disk_end: int = 199, seed: int = 0) -> Dict:
+    """Fire `total` schedule requests over `concurrency` keep-alive connections; report rps and latency."""
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    bodies = [json.dumps({"algorithm": algorithm, "requests": rng.integers(0, disk_end + 1, size).tolist(),
+                          "head": int(rng.integers(0, disk_end + 1)), "disk_end": disk_end}).encode()
+              for _ in range(min(total, 64))]
+    plan = [[bodies[i % len(bodies)] for i in range(c, total, concurrency)] for c in range(concurrency)]
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, p, latencies, errors) for p in plan if p))
+    elapsed = time.perf_counter() - start
+    lat = np.array(latencies) * 1000.0
+    p50, p95, p99 = np.percentile(lat, [50, 95, 99]) if lat.size else (0, 0, 0)
+    return {"requests": len(latencies), "errors": len(errors), "concurrency": concurrency, "size": size,
+            "algorithm": algorithm, "seconds": round(elapsed, 3),
+            "requests_per_sec": round(len(latencies) / elapsed, 1) if elapsed > 0 else 0,
+            "latency_p50_ms": round(float(p50), 3), "latency_p95_ms": round(float(p95), 3),
+            "latency_p99_ms": round(float(p99), 3), "latency_max_ms": round(float(lat.max()), 3) if lat.size else 0}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local disk scheduling HTTP service.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="run the service")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes (0 = threads)")
+    serve.add_argument("--max-batch", type=int, default=64)
+    serve.add_argument("--max-delay-ms", type=float, default=2.0)
+    load = sub.add_parser("load", help="load-test a running service")
+    load.add_argument("--host", default="127.0.0.1")
+    load.add_argument("--port", type=int, default=8765)
+    load.add_argument("--concurrency", type=int, default=16)
+    load.add_argument("--total", type=int, default=1000)
+    load.add_argument("--size", type=int, default=1000, help="cylinders per request")
+    load.add_argument("--algorithm", type=str.upper, default="SSTF", choices=ALGORITHM_NAMES)
+    load.add_argument("--disk-end", type=int, default=199)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        service = SchedulingService(args.host, args.port, args.workers, args.max_batch, args.max_delay_ms)
+        try:
+            asyncio.run(service.serve_forever())
+        except KeyboardInterrupt:
+            pass
+    else:
+        report = asyncio.run(load_test(args.host, args.port, args.concurrency, args.total, args.size,
+                                       args.algorithm, args.disk_end))
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+# tests/test_history.py
+import pytest
+import utils
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, "DB_FILE", str(tmp_path / "runs.db"))
+    names = ["run", "run1", "run😀", "run￿", "ruo", "ru", "rux\U0010ffff", "\U0010ffff\U0010ffffx"]
+    metrics = {"total_head_movement": 1}
+    utils.save_runs([dict(name=n, requests_text="1", head=0, algorithm="FCFS", direction="right",
+                          disk_start=0, disk_end=199, seek_ms=1.0, metrics=metrics) for n in names]).result(timeout=5)
+    return names
+
+
+@pytest.mark.parametrize("prefix", ["run", "ru", "rux", "\U0010ffff", "\U0010ffff\U0010ffff", "run😀"])
+def test_name_prefix_matches_astral_characters(history, prefix):
+    found = {row[1] for row in utils.query_history(limit=100, name_prefix=prefix)}
+    assert found == {n for n in history if n.startswith(prefix)}
+    assert utils.count_history(name_prefix=prefix) == len(found)
+
+
+def test_latest_run_id_changes_on_save(history):
+    before = utils.latest_run_id()
+    utils.save_run("later", "1", 0, "FCFS", "right", 0, 199, 1.0, {}).result(timeout=5)
+    assert utils.latest_run_id() > before
@@ -0,0 +1,36 @@
+# tests/test_metrics.py
+import numpy as np
+import pytest
+from metrics import PiecewiseSeek, SqrtSettleSeek, parse_seek_table
+from online import simulate_online, summarize_online
+from geometry import DiskGeometry, Zone
+
+
+def test_piecewise_seek_scalar_matches_array():
+    model = parse_seek_table("1:1.0, 50:4.0, 200:10.0")
+    distances = np.array([0, 1, 25, 50, 200, 300])
+    expected = model(distances)
+    assert expected.shape == distances.shape
+    for d, ms in zip(distances, expected):
+        assert float(model(int(d))) == pytest.approx(ms)
+    assert np.shape(model(7)) == ()
+    assert float(model(300)) == pytest.approx(14.0)  # extrapolated past the last point
+    assert float(model(0)) == 0.0
+
+
+def test_piecewise_seek_keeps_input_shape():
+    model = PiecewiseSeek([0, 100], [0.0, 5.0])
+    assert model(np.array([[10, 200], [0, 50]])).shape == (2, 2)
+
+
+def test_online_simulator_with_piecewise_seek():
+    model = parse_seek_table("1:1.0, 50:4.0, 200:10.0")
+    arrivals = [(0.0, 98), (0.0, 183), (1.0, 37), (2.0, 122)]
+    summary = summarize_online(simulate_online(arrivals, "SSTF", 53, seek_model=model))
+    assert summary["requests"] == 4
+
+
+def test_geometry_seek_beyond_table_with_piecewise_seek():
+    geometry = DiskGeometry(100, 2, [Zone(0, 63)], seek_model=PiecewiseSeek([1, 50], [1.0, 4.0]))
+    assert geometry.seek_ms(150) == pytest.approx(4.0 + 100 * 3.0 / 49)
+    assert DiskGeometry(100, 2, [Zone(0, 63)], seek_model=SqrtSettleSeek()).seek_ms(150) > 0
@@ -0,0 +1,16 @@
+# tests/test_results.py
+import numpy as np
+import pytest
+from algorithms import ALGORITHM_NAMES, run_algorithm
+
+
+def test_small_paths_stay_int32():
+    assert run_algorithm("FCFS", [98, 183, 37], 53).path.dtype == np.int32
+
+
+@pytest.mark.parametrize("name", ALGORITHM_NAMES)
+def test_cylinders_beyond_int32_do_not_wrap(name):
+    res = run_algorithm(name, [3_000_000_000, 5], 0, "right", 0, 4_000_000_000)
+    assert res.path.max() >= 3_000_000_000
+    assert res.metrics()["total_head_movement"] == res.total_head_movement
+    assert sorted(res.order.tolist()) == [5, 3_000_000_000]
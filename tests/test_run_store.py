@@ -0,0 +1,34 @@
+# tests/test_run_store.py
+import sqlite3
+import pytest
+import run_store
+
+ROW = run_store.metrics_row("run", "1, 2", 0, "FCFS", "right", 0, 199, 1.0, {"total_head_movement": 3})
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = run_store.RunStore(str(tmp_path / "runs.db"))
+    yield s
+    s.close()
+
+
+def test_submit_resolves_to_rows_written(store):
+    saves = [store.submit([ROW, ROW]) for _ in range(50)]
+    store.flush()
+    assert [s.result(timeout=5) for s in saves] == [2] * 50
+    assert store.written == 100
+
+
+def test_failure_goes_to_its_own_submitter_only(store):
+    with sqlite3.connect(store.db_file) as conn:
+        conn.execute("DROP TABLE runs")
+    failed = store.submit([ROW])
+    with pytest.raises(run_store.RunStoreError):
+        failed.result(timeout=5)
+    with sqlite3.connect(store.db_file) as conn:
+        for stmt in run_store.SCHEMA_STATEMENTS:
+            conn.execute(stmt)
+    # the next session's save is not blamed for the earlier failure
+    assert store.submit([ROW]).result(timeout=5) == 1
+    assert store.failed == 1
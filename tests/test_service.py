@@ -0,0 +1,51 @@
+# tests/test_service.py
+import asyncio
+import time
+import service
+
+
+def _slow_batches(monkeypatch, seconds):
+    evaluate = service.evaluate_batch
+    monkeypatch.setattr(service, "evaluate_batch", lambda jobs: time.sleep(seconds) or evaluate(jobs))
+
+
+def _job(requests):
+    return {"op": "schedule", "algorithm": "FCFS", "requests": requests, "head": 0}
+
+
+def test_cancelling_serve_forever_resolves_pending_jobs(monkeypatch):
+    _slow_batches(monkeypatch, 0.3)
+
+    async def main():
+        svc = service.SchedulingService(port=0, workers=0)  # batches run on the loop's thread pool
+        serving = asyncio.create_task(svc.serve_forever())
+        while svc._server is None:
+            await asyncio.sleep(0.01)
+        pending = [asyncio.create_task(svc.batcher.submit(_job([i, i + 1]))) for i in range(8)]
+        await asyncio.sleep(0.05)  # let the first batch reach the pool
+        serving.cancel()
+        try:
+            await serving
+        except asyncio.CancelledError:
+            pass
+        assert all(task.done() for task in pending)
+        assert svc.batcher._task.done() and not svc.batcher._inflight
+        return [task.result() for task in pending]
+
+    results = asyncio.run(main())
+    assert all(ok for ok, _ in results)  # in flight at cancellation, so they were waited for
+
+
+def test_batcher_stop_fails_batches_past_the_timeout(monkeypatch):
+    _slow_batches(monkeypatch, 1.0)
+
+    async def main():
+        batcher = service.MicroBatcher()
+        batcher.start()
+        task = asyncio.create_task(batcher.submit(_job([1, 2])))
+        await asyncio.sleep(0.05)
+        await batcher.stop(timeout=0.1)
+        assert task.done()
+        return task.result()
+
+    assert asyncio.run(main()) == (False, "service is shutting down")
@@ -0,0 +1,166 @@
+# traces.py
+"""
+Bulk trace ingestion.
+Trace files are memory-mapped and parsed in newline-aligned chunks straight into
+int32 cylinder arrays, so large traces never pass through a Python string.
+Supported formats: csv, whitespace, blktrace (blkparse text output) and fio iologs.
+Block formats carry sectors/byte offsets, which are mapped to cylinders.
+"""
+import io
+import mmap
+import os
+import re
+from typing import Iterator, Optional
+import numpy as np
+from profiling import timed
+
+FORMATS = ("csv", "whitespace", "blktrace", "fio")
+CHUNK_BYTES = 8 << 20
+SECTOR_SIZE = 512
+SECTORS_PER_CYLINDER = 16 * 63  # classic 16 heads x 63 sectors per track
+# server-side traces (over the upload limit) may only be read from this directory
+TRACE_DIR = os.environ.get("DISKSCHED_TRACE_DIR")
+
+# blkparse: "8,0  3  1  0.000000000  697  Q  W 223490 + 8 [kjournald]"
+_BLKTRACE_RE = rb"^\s*\d+,\d+\s+\d+\s+\d+\s+[\d.]+\s+\d+\s+%s\s+\S+\s+(\d+)\s+\+"
+# fio iolog v2/v3: "[timestamp] /dev/sdb write 1048576 4096"
+_FIO_RE = re.compile(rb"^\s*(?:\d+\s+)?\S+\s+(?:read|write|trim)\s+(\d+)\s+\d+", re.M)
+_HEADER_RE = re.compile(rb"[A-DF-Za-df-z]")  # letters other than e/E (exponents)
+
+
+def detect_format(path: str) -> str:
+    if path.lower().endswith(".csv"):
+        return "csv"
+    with open(path, "rb") as f:
+        head = f.read(4096)
+    if b"fio version" in head or _FIO_RE.search(head):
+        return "fio"
+    if re.search(_BLKTRACE_RE % rb"[A-Z]+", head, re.M):
+        return "blktrace"
+    return "csv" if b"," in head else "whitespace"
+
+
+def _chunks(buf, chunk_bytes: int) -> Iterator[bytes]:
+    start, size = 0, len(buf)
+    while start < size:
+        end = min(start + chunk_bytes, size)
+        if end < size:
+            nl = buf.rfind(b"\n", start, end)
+            end = nl + 1 if nl >= start else size
+        yield buf[start:end]
+        start = end
+
+
+def _to_int32(tokens, source: str) -> np.ndarray:
+    try:
+        values = np.array(tokens).astype(np.int64)
+    except ValueError:
+        # the offending token is not echoed back: it is file content, not user input
+        raise ValueError(f"{source} contains a request value that is not an integer") from None
+    if values.size and (values.min() < np.iinfo(np.int32).min or values.max() > np.iinfo(np.int32).max):
+        raise ValueError(f"Cylinder values in {source} do not fit in int32")
+    return values.astype(np.int32)
+
+
+def _parse_values(chunk: bytes, source: str) -> np.ndarray:
+    return _to_int32(chunk.replace(b",", b" ").split(), source)
+
+
+def _parse_csv_column(chunk: bytes, column: int, source: str) -> np.ndarray:
+    try:
+        values = np.loadtxt(io.BytesIO(chunk), delimiter=",", usecols=column, dtype=np.int64, ndmin=1)
+    except ValueError:
+        raise ValueError(f"{source} has a row without an integer in column {column}") from None
+    return _to_int32(values, source)
+
+
+def _parse_sectors(chunk: bytes, pattern: re.Pattern, divisor: int, source: str) -> np.ndarray:
+    found = pattern.findall(chunk)
+    if not found:
+        return np.empty(0, dtype=np.int32)
+    return _to_int32(np.array(found).astype(np.int64) // divisor, source)
+
+
+def _check_single_column(chunk: bytes, source: str) -> None:
+    """
+    Reject a table: several rows with the same number (> 1) of single-value fields.
+    Comma lists whose lines vary in length, or mix in spaces, are request lists.
+    """
+    rows = [line for line in chunk[:65536].splitlines() if line.strip()][:20]
+    if len(rows) < 2:
+        return
+    fields = [[f for f in row.split(b",") if f.strip()] for row in rows]
+    widths = {len(row) for row in fields}
+    if len(widths) == 1 and widths.pop() > 1 and all(len(f.split()) == 1 for row in fields for f in row):
+        raise ValueError(f"{source} has {len(fields[0])} CSV columns; choose the column that holds the cylinders")
+
+
+def resolve_trace_path(name: str, trace_dir: Optional[str] = TRACE_DIR) -> str:
+    """Real path of `name` inside `trace_dir`; anything outside it is refused."""
+    if not trace_dir:
+        raise ValueError("Server-side traces are disabled (set DISKSCHED_TRACE_DIR)")
+    root = os.path.realpath(trace_dir)
+    path = os.path.realpath(os.path.join(root, name))
+    if os.path.commonpath([root, path]) != root or not os.path.isfile(path):
+        raise ValueError(f"No trace named {name!r} in the trace directory")
+    return path
+
+
+def iter_trace(path: str, fmt: str = "auto", chunk_bytes: int = CHUNK_BYTES,
+               column: Optional[int] = None, action: str = "Q",
+               sectors_per_cylinder: int = SECTORS_PER_CYLINDER,
+               sector_size: int = SECTOR_SIZE) -> Iterator[np.ndarray]:
+    """
+    Yield int32 arrays of cylinder requests, one per chunk of the file.
+    Multi-column CSVs need `column` (0-based); without it they are rejected.
+    """
+    fmt = detect_format(path) if fmt == "auto" else fmt
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown trace format: {fmt}")
+    if os.path.getsize(path) == 0:
+        return
+    source = os.path.basename(path)
+    blk_re = re.compile(_BLKTRACE_RE % re.escape(action.encode()), re.M)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        first = True
+        for chunk in _chunks(buf, chunk_bytes):
+            if fmt == "blktrace":
+                values = _parse_sectors(chunk, blk_re, sectors_per_cylinder, source)
+            elif fmt == "fio":
+                values = _parse_sectors(chunk, _FIO_RE, sector_size * sectors_per_cylinder, source)
+            else:
+                if first and fmt == "csv":
+                    line_end = chunk.find(b"\n")
+                    line = chunk if line_end < 0 else chunk[:line_end]
+                    if _HEADER_RE.search(line):
+                        chunk = chunk[len(line):]
+                    if column is None:
+                        _check_single_column(chunk, source)
+                if fmt == "csv" and column is not None:
+                    values = _parse_csv_column(chunk, column, source) if chunk.strip() else np.empty(0, np.int32)
+                else:
+                    values = _parse_values(chunk, source)
+            first = False
+            if values.size:
+                yield values
+
+
+@timed("parse_trace")
+def load_trace(path: str, **kwargs) -> np.ndarray:
+    parts = list(iter_trace(path, **kwargs))
+    if not parts:
+        return np.empty(0, dtype=np.int32)
+    return np.concatenate(parts)
+
+
+def spool_to_tempfile(fileobj, suffix: str = "") -> str:
+    """
+    Copy an uploaded file object to disk in chunks and return the temp path.
+    Streamlit uploads are already held in server memory, so this only saves a second
+    in-memory copy; large traces should be read from a server-side path instead.
+    """
+    import shutil
+    import tempfile
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+        shutil.copyfileobj(fileobj, tmp, length=CHUNK_BYTES)
+        return tmp.name
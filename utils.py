@@ -1,11 +1,14 @@
 # utils.py
-import sqlite3
-import csv
-import io
-from typing import List, Dict
+from concurrent.futures import Future
+from typing import Dict, Iterable, List, Optional
+from metrics import compute_metrics
+from run_store import get_run_store, metrics_row
+from profiling import timed
 
 DB_FILE = "disk_runs.db"
+HISTORY_COLUMNS = ["id","name","requests","head","algorithm","direction","disk_start","disk_end","seek_ms","total_movement","avg_seek","throughput","efficiency","timestamp"]
 
+@timed("parse_requests")
 def parse_requests(text: str) -> List[int]:
     if text is None:
         return []
@@ -17,72 +20,103 @@ def parse_requests(text: str) -> List[int]:
     for p in parts:
         try:
             nums.append(int(p))
-        except:
+        except ValueError:
             raise ValueError(f"Invalid request value: {p}")
     return nums
 
-def compute_disk_metrics(path: List[int], requests_count: int, seek_time_per_cylinder_ms: float = 1.0) -> Dict:
-    total_movement = 0
-    for i in range(1, len(path)):
-        total_movement += abs(path[i] - path[i-1])
-    avg_seek = total_movement / requests_count if requests_count > 0 else 0
-    total_time_seconds = (total_movement * seek_time_per_cylinder_ms) / 1000.0
-    throughput = (requests_count / total_time_seconds) if total_time_seconds > 0 else 0
-    return {
-        "total_head_movement": int(total_movement),
-        "average_seek_distance": round(avg_seek, 3),
-        "total_time_seconds": round(total_time_seconds, 5),
-        "throughput_req_per_sec": round(throughput, 3)
-    }
+def compute_disk_metrics(path: List[int], requests_count: int, seek_time_per_cylinder_ms: float = 1.0,
+                         seek_model=None, rotational_latency_ms: float = 0.0) -> Dict:
+    return compute_metrics(path, requests_count, seek_model=seek_model,
+                           seek_time_per_cylinder_ms=seek_time_per_cylinder_ms,
+                           rotational_latency_ms=rotational_latency_ms)
 
 # --- SQLite helpers ---
 def init_db():
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS runs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT,
-            requests TEXT,
-            head INTEGER,
-            algorithm TEXT,
-            direction TEXT,
-            disk_start INTEGER,
-            disk_end INTEGER,
-            seek_ms REAL,
-            total_movement INTEGER,
-            avg_seek REAL,
-            throughput REAL,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    conn.commit()
-    conn.close()
+    """Create the schema and start the write-behind store; cheap after the first call."""
+    return get_run_store(DB_FILE)
 
+@timed("save")
 def save_run(name: str, requests_text: str, head: int, algorithm: str, direction: str,
-             disk_start: int, disk_end: int, seek_ms: float, metrics: Dict):
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute('''
-        INSERT INTO runs (name, requests, head, algorithm, direction, disk_start, disk_end, seek_ms, total_movement, avg_seek, throughput)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (name, requests_text, head, algorithm, direction, disk_start, disk_end, seek_ms,
-          metrics.get("total_head_movement", 0), metrics.get("average_seek_distance", 0), metrics.get("throughput_req_per_sec", 0)))
-    conn.commit()
-    conn.close()
+             disk_start: int, disk_end: int, seek_ms: float, metrics: Dict) -> Future:
+    """Queue one run; the returned Future fails with RunStoreError if it was not saved."""
+    return get_run_store(DB_FILE).submit([metrics_row(name, requests_text, head, algorithm, direction,
+                                                      disk_start, disk_end, seek_ms, metrics)])
 
-def fetch_history():
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute('SELECT id, name, requests, head, algorithm, direction, disk_start, disk_end, seek_ms, total_movement, avg_seek, throughput, timestamp FROM runs ORDER BY id DESC')
-    rows = c.fetchall()
-    conn.close()
-    return rows
+@timed("save")
+def save_runs(runs: Iterable[Dict]) -> Future:
+    """Bulk save; each run is a dict of save_run keyword arguments. Committed as one batch."""
+    return get_run_store(DB_FILE).submit([metrics_row(**r) for r in runs])
 
-def history_to_csv(rows):
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(["id","name","requests","head","algorithm","direction","disk_start","disk_end","seek_ms","total_movement","avg_seek","throughput","timestamp"])
-    for r in rows:
-        writer.writerow(r)
-    return output.getvalue()
+def _prefix_upper_bound(prefix: str) -> Optional[str]:
+    """Smallest string above every string starting with `prefix` (code point order = SQLite's UTF-8 order)."""
+    while prefix:
+        code = ord(prefix[-1]) + 1
+        if code == 0xD800:
+            code = 0xE000  # surrogates can't be stored as UTF-8
+        if code <= 0x10FFFF:
+            return prefix[:-1] + chr(code)
+        prefix = prefix[:-1]
+    return None
+
+def _history_filters(algorithm: Optional[str] = None, name_prefix: Optional[str] = None,
+                     since: Optional[str] = None, until: Optional[str] = None):
+    clauses, params = [], []
+    if algorithm:
+        clauses.append('algorithm = ?'); params.append(algorithm)
+    if name_prefix:
+        # range form of a prefix match, so idx_runs_name can be used
+        clauses.append('name >= ?'); params.append(name_prefix)
+        upper = _prefix_upper_bound(name_prefix)
+        if upper is not None:
+            clauses.append('name < ?'); params.append(upper)
+    if since:
+        clauses.append('timestamp >= ?'); params.append(since)
+    if until:
+        clauses.append('timestamp < ?'); params.append(until)
+    return clauses, params
+
+def query_history(limit: int = 50, before_id: Optional[int] = None, **filters):
+    """One page of runs, newest first. Pass the last id of a page as before_id to get the next one."""
+    clauses, params = _history_filters(**filters)
+    if before_id is not None:
+        clauses.append('id < ?'); params.append(before_id)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    with get_run_store(DB_FILE).reader() as conn:
+        return conn.execute(f'SELECT {", ".join(HISTORY_COLUMNS)} FROM runs {where} ORDER BY id DESC LIMIT ?',
+                            (*params, limit)).fetchall()
+
+def latest_run_id() -> int:
+    """Id of the newest saved run (0 if none); changes whenever a run is saved."""
+    with get_run_store(DB_FILE).reader() as conn:
+        return conn.execute('SELECT COALESCE(MAX(id), 0) FROM runs').fetchone()[0]
+
+def count_history(**filters) -> int:
+    clauses, params = _history_filters(**filters)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    with get_run_store(DB_FILE).reader() as conn:
+        return conn.execute(f'SELECT COUNT(*) FROM runs {where}', params).fetchone()[0]
+
+def history_aggregates(**filters):
+    """Per-algorithm run count and movement/throughput statistics, computed in SQL."""
+    clauses, params = _history_filters(**filters)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    with get_run_store(DB_FILE).reader() as conn:
+        return conn.execute(f'''
+            SELECT algorithm, COUNT(*), AVG(total_movement), MIN(total_movement), MAX(total_movement),
+                   AVG(throughput), MAX(throughput), AVG(efficiency)
+            FROM runs {where} GROUP BY algorithm ORDER BY algorithm
+        ''', params).fetchall()
+
+HISTORY_BUCKETS = {"hour": "%Y-%m-%d %H:00", "day": "%Y-%m-%d", "month": "%Y-%m"}
+
+def throughput_over_time(bucket: str = "day", **filters):
+    """Average throughput per (time bucket, algorithm), computed in SQL."""
+    if bucket not in HISTORY_BUCKETS:
+        raise ValueError(f"Unknown bucket: {bucket}")
+    clauses, params = _history_filters(**filters)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    with get_run_store(DB_FILE).reader() as conn:
+        return conn.execute(f'''
+            SELECT strftime(?, timestamp) AS bucket, algorithm, COUNT(*), AVG(throughput), AVG(total_movement)
+            FROM runs {where} GROUP BY bucket, algorithm ORDER BY bucket
+        ''', (HISTORY_BUCKETS[bucket], *params)).fetchall()
@@ -0,0 +1,61 @@
+# workloads.py
+"""
+Seeded synthetic workload generators. Each takes (n, rng, disk_start, disk_end)
+and returns an int64 array of cylinder requests.
+"""
+from typing import Callable, Dict
+import numpy as np
+
+
+def uniform(n: int, rng: np.random.Generator, disk_start: int = 0, disk_end: int = 199) -> np.ndarray:
+    return rng.integers(disk_start, disk_end + 1, n)
+
+
+def zipf_hotspot(n: int, rng: np.random.Generator, disk_start: int = 0, disk_end: int = 199,
+                 a: float = 1.3, hot_spots: int = 16) -> np.ndarray:
+    """A few hot cylinders with Zipf-distributed popularity, plus small jitter around them."""
+    spots = rng.integers(disk_start, disk_end + 1, hot_spots)
+    rank = np.minimum(rng.zipf(a, n), hot_spots) - 1
+    jitter = rng.integers(-2, 3, n)
+    return np.clip(spots[rank] + jitter, disk_start, disk_end)
+
+
+def sequential_runs(n: int, rng: np.random.Generator, disk_start: int = 0, disk_end: int = 199,
+                    mean_run: int = 32) -> np.ndarray:
+    """Runs of consecutive cylinders starting at random positions."""
+    runs = rng.geometric(1.0 / mean_run, n)
+    starts = np.repeat(rng.integers(disk_start, disk_end + 1, n), runs)[:n]
+    run_ids = np.repeat(np.arange(n), runs)[:n]
+    offset = np.arange(n) - np.searchsorted(run_ids, run_ids)
+    span = disk_end - disk_start + 1
+    return disk_start + (starts - disk_start + offset) % span
+
+
+def bursty(n: int, rng: np.random.Generator, disk_start: int = 0, disk_end: int = 199,
+           burst: int = 20, spread: float = 0.02) -> np.ndarray:
+    """Bursts of requests tightly clustered around a random centre."""
+    centres = np.repeat(rng.integers(disk_start, disk_end + 1, n // burst + 1), burst)[:n]
+    width = max(1.0, spread * (disk_end - disk_start))
+    return np.clip(np.rint(centres + rng.normal(0, width, n)).astype(np.int64), disk_start, disk_end)
+
+
+def bimodal(n: int, rng: np.random.Generator, disk_start: int = 0, disk_end: int = 199) -> np.ndarray:
+    """Two normal modes near the inner and outer quarter of the disk."""
+    span = disk_end - disk_start
+    modes = np.where(rng.random(n) < 0.5, disk_start + 0.25 * span, disk_start + 0.75 * span)
+    return np.clip(np.rint(rng.normal(modes, 0.06 * span)).astype(np.int64), disk_start, disk_end)
+
+
+WORKLOADS: Dict[str, Callable] = {
+    "uniform": uniform,
+    "zipf": zipf_hotspot,
+    "sequential": sequential_runs,
+    "bursty": bursty,
+    "bimodal": bimodal,
+}
+
+
+def generate(kind: str, n: int, seed: int = 0, disk_start: int = 0, disk_end: int = 199) -> np.ndarray:
+    if kind not in WORKLOADS:
+        raise ValueError(f"Unknown workload: {kind}")
+    return WORKLOADS[kind](n, np.random.default_rng(seed), disk_start, disk_end)